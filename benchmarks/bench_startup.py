@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import time
+
+BUDGET_MS = 30.0
+RUNS = 7
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times():
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import regart.__main__'],
+        cwd=ROOT, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, check=True
+    ).stderr.decode('utf-8')
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            self_time, cumulative = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue
+        times[fields[2].strip()] = (self_time, cumulative)
+    return times
+
+
+def wall_time_ms(args):
+    start = time.perf_counter()
+    subprocess.run(args, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+    runs = [import_times() for _ in range(RUNS)]
+    best = min(runs, key=lambda times: times['regart.__main__'][1])
+    import_ms = best['regart.__main__'][1] / 1000.0
+
+    interpreter = min(wall_time_ms([sys.executable, '-c', 'pass']) for _ in range(RUNS))
+    cli = min(wall_time_ms([sys.executable, '-m', 'regart']) for _ in range(RUNS))
+
+    print('regart import time:     {:8.2f} ms (budget {} ms)'.format(import_ms, budget))
+    print('bare interpreter:       {:8.2f} ms'.format(interpreter))
+    print('regart cold start:      {:8.2f} ms'.format(cli))
+    print('slowest imports:')
+    slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    for name, (self_time, cumulative) in slowest:
+        print('  {:40} {:8.2f} ms'.format(name, self_time / 1000.0))
+
+    if import_ms > budget:
+        print('Cold start import time exceeded the {} ms budget.'.format(budget))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
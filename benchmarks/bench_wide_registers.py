@@ -0,0 +1,51 @@
+import sys
+import timeit
+
+from regart import _normalize
+from regart import _transform_sections
+from regart import _validate_section_position
+from regart import _validate_section_size
+from regart import _forgive
+
+BUDGET_MS = 10.0
+REPEAT = 20
+
+
+def wide_register(width, step, holes=0):
+    sections = dict(
+        ('S{}'.format(pos), {'position': pos, 'size': step})
+        for pos in range(holes * step, width, step)
+    )
+    return {'name': 'WIDE', 'width': width, 'sections': sections}
+
+
+def transformed(width, step, holes=0):
+    return _transform_sections(_normalize(wide_register(width, step, holes)))
+
+
+def best_ms(func):
+    return min(timeit.repeat(func, number=1, repeat=REPEAT)) * 1000
+
+
+def main():
+    failed = False
+    for width in [1024, 2048, 4096]:
+        for step in [1, 8, 64]:
+            reg = transformed(width, step)
+            validation = best_ms(lambda: (
+                _validate_section_position(reg.sections, False),
+                _validate_section_size(reg.sections, reg.width, False)
+            ))
+            partial = transformed(width, step, holes=width // step // 2)
+            forgiveness = best_ms(lambda: _forgive(partial.sections, width))
+            print('width={:5} sections={:5}  validation={:8.3f} ms  hole filling={:8.3f} ms'.format(
+                width, width // step, validation, forgiveness))
+            if width == 4096 and validation > BUDGET_MS:
+                failed = True
+    if failed:
+        print('Validating a 4096 bit register exceeded the {} ms budget.'.format(BUDGET_MS))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
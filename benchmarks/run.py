@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+import regart
+from regart import generate
+from regart import generate_many
+from regart import _forgive
+from regart import _generate_bits
+from regart import _normalize
+from regart import _transform_sections
+from regart import _validate_section_position
+
+WIDTHS = [8, 32, 128, 512, 1024, 4096]
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def register(width, count, holes=False):
+    size = width // count
+    sections = {}
+    for i in range(count):
+        if holes and i % 2:
+            continue
+        position = i * size
+        sections['S{}'.format(position)] = {
+            'position': position,
+            'size': width - position if i == count - 1 else size
+        }
+    return {'name': 'REG', 'address': '0x40000000', 'width': width, 'sections': sections}
+
+
+def section_counts(width):
+    return sorted(set([1, max(1, width // 8), width]))
+
+
+def best_ms(func, repeat=5):
+    func()
+    number = 1
+    while number < 1000 and timeit.timeit(func, number=number) < 0.02:
+        number *= 10
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+
+def transformed(width, count, holes=False):
+    return _transform_sections(_normalize(register(width, count, holes)))
+
+
+def bench_layout(widths):
+    results = {}
+    for width in widths:
+        for count in section_counts(width):
+            case = 'w={}/s={}'.format(width, count)
+            for forgiveness in [False, True]:
+                reg = register(width, count, holes=forgiveness)
+                key = 'generate/{}/forgive={}'.format(case, int(forgiveness))
+                results[key] = best_ms(lambda: generate(reg, forgiveness))
+
+            reg = transformed(width, count)
+            results['validate_position/' + case] = best_ms(lambda: _validate_section_position(reg.sections, False))
+
+            partial = transformed(width, count, holes=True)
+            results['forgive/' + case] = best_ms(lambda: _forgive(partial.sections, width))
+        results['generate_bits/w={}'.format(width)] = best_ms(lambda: _generate_bits(width, {}))
+    return results
+
+
+def bench_batch(count, workers):
+    regs = [register(32, 8) for _ in range(count)]
+    for i, reg in enumerate(regs):
+        reg['name'] = 'REG{}'.format(i)
+    results = {}
+    for worker_count in sorted(set([1, workers])):
+        seconds = min(timeit.repeat(lambda: generate_many(regs, workers=worker_count, chunksize=64),
+                                    number=1, repeat=3))
+        results['batch/workers={}'.format(worker_count)] = count / seconds
+    return results
+
+
+def compare(current, baseline, tolerance):
+    regressions = []
+    for key, value in sorted(current['timings_ms'].items()):
+        old = baseline.get('timings_ms', {}).get(key)
+        if old is not None and value > old * (1 + tolerance) and value - old > 0.01:
+            regressions.append('{}: {:.4f} ms -> {:.4f} ms'.format(key, old, value))
+    for key, value in sorted(current['throughput'].items()):
+        old = baseline.get('throughput', {}).get(key)
+        if old is not None and value < old / (1 + tolerance):
+            regressions.append('{}: {:.0f} -> {:.0f} registers/s'.format(key, old, value))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regart layout benchmarks.')
+    parser.add_argument('--output', help='write the results as JSON into this file')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON file to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=1.0, help='allowed relative slowdown (default: 1.0)')
+    parser.add_argument('--quick', action='store_true', help='only run the narrow register widths')
+    parser.add_argument('--batch', type=int, default=2000, help='number of registers in the batch benchmark')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='workers of the batch benchmark')
+    args = parser.parse_args()
+
+    widths = [width for width in WIDTHS if not args.quick or width <= 128]
+    current = {
+        'regart': regart.__version__,
+        'python': platform.python_version(),
+        'timings_ms': bench_layout(widths),
+        'throughput': bench_batch(args.batch, args.workers)
+    }
+
+    for key, value in sorted(current['timings_ms'].items()):
+        print('{:45} {:10.4f} ms'.format(key, value))
+    for key, value in sorted(current['throughput'].items()):
+        print('{:45} {:10.0f} registers/s'.format(key, value))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(current, json.load(f), args.tolerance)
+        if regressions:
+            print('Performance regressions against {}:'.format(args.baseline))
+            for regression in regressions:
+                print('  ' + regression)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
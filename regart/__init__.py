@@ -1,165 +1,632 @@
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections import deque, namedtuple, OrderedDict
+
+from regart.cache import DiskCache
+
+__version__ = '1.0.5'
+
+# Bump whenever the rendered output of an unchanged definition changes, so
+# stored art (disk cache, header blocks, register databases) is rendered again.
+RENDER_FORMAT = 2
+
+
+def generate(reg_in, forgiveness=False, cache=None, stats=None, value=None, value_format='hex'):
+    if cache is None:
+        cache = _environment_cache()
+    if not cache:
+        return _render(compile(reg_in, forgiveness, stats), stats, value, value_format)
+    if cache is True:
+        cache = _default_cache
+    register = _normalize(reg_in, stats)
+    key = _fingerprint(register, forgiveness)
+    if value is not None:
+        key += (normalize_to_int(value, 'value'), value_format)
+    result = cache.get(key)
+    if result is None:
+        result = _render(_compile_normalized(register, forgiveness, stats), stats, value, value_format)
+        cache.put(key, result)
+    elif stats is not None:
+        stats.count('cache hits')
+    return result
+
+
+def iter_lines(reg_in, forgiveness=False, stats=None):
+    return compile(reg_in, forgiveness, stats).iter_lines()
+
+
+def render_to(reg_in, stream, forgiveness=False, stats=None):
+    layout = compile(reg_in, forgiveness, stats)
+    if stats is None:
+        layout.render_to(stream)
+    else:
+        start = time.perf_counter()
+        layout.render_to(stream)
+        stats.add_time('render', time.perf_counter() - start)
 
-def generate(reg_in, forgiveness=False):
-    reg = dict(reg_in)
-    _normalize_fields(reg)
-    _transform_sections(reg, forgiveness)
-    _validate_section_position(reg, forgiveness)
-    _validate_section_size(reg, forgiveness)
 
-    expands = {}
+def compile(reg_in, forgiveness=False, stats=None):
+    return _compile_normalized(_normalize(reg_in, stats), forgiveness, stats)
 
-    global_width = _default_width_for_size(reg['width'])
 
-    if 'address' not in reg:
-        reg['address'] = ''
-    title_min_width = len(reg['name']) + len(reg['address']) + 1
+def field_at(reg_in, bit, forgiveness=False):
+    return compile(reg_in, forgiveness).field_at(bit)
 
-    diff = _default_width_for_size(reg['width']) - title_min_width
-    if diff < 0:
-        expands[0] = -diff
-        title_space = 1
-        global_width = title_min_width
-    else:
-        title_space = global_width - title_min_width + 1
-
-    extra_title_space = 0
-    if len(reg['sections']) >= 1 and reg['name'] != reg['sections'][0]['name']:
-        sections = []
-        for s in reg['sections']:
-            section_space = _default_width_for_size(s['size']) - len(s['name'])
-            if section_space < 0:
-                if s['position'] in expands:
-                    old = expands[s['position']]
-                    section_space = old
-                    global_width += max(-section_space, old)
-                    extra_title_space += max(-section_space, old)
-                    expands[s['position']] += max(-section_space, old)
-                else:
-                    global_width += -section_space
-                    extra_title_space += -section_space
-                    expands[s['position']] = -section_space
+
+def fields_in_range(reg_in, lo, hi, forgiveness=False):
+    return compile(reg_in, forgiveness).fields_in_range(lo, hi)
+
+
+def decode_array(reg_in, values, forgiveness=False):
+    return compile(reg_in, forgiveness).decode_array(values)
+
+
+def validate(reg_in, forgiveness=False, collect=False):
+    if collect:
+        return _collect_violations(reg_in, forgiveness)
+    register = _normalize(reg_in)
+    sections = _sort_sections(register.sections)
+    if forgiveness:
+        sections, _ = _forgive(sections, register.width)
+    _validate_section_position(sections, forgiveness)
+    _validate_section_size(sections, register.width, forgiveness)
+
+
+def _render(layout, stats, value=None, value_format='hex'):
+    if stats is None:
+        return layout.render(value=value, value_format=value_format)
+    start = time.perf_counter()
+    result = layout.render(value=value, value_format=value_format)
+    stats.add_time('render', time.perf_counter() - start)
+    return result
+
+
+Section = namedtuple('Section', ['name', 'position', 'size'])
+
+Register = namedtuple('Register', ['name', 'address', 'width', 'sections', 'implicit'])
+
+
+def _normalize(reg_in, stats=None):
+    if stats is not None:
+        start = time.perf_counter()
+    register = _normalize_fields(reg_in)
+    if stats is not None:
+        stats.add_time('normalize', time.perf_counter() - start)
+        stats.count('registers')
+    return register
+
+
+def _compile_normalized(register, forgiveness, stats=None):
+    if stats is not None:
+        return _compile_normalized_with_stats(register, forgiveness, stats)
+    sections = _sort_sections(register.sections)
+    report = ()
+    if forgiveness:
+        sections, report = _forgive(sections, register.width)
+    _validate_section_position(sections, forgiveness)
+    _validate_section_size(sections, register.width, forgiveness)
+    return _build_layout(register._replace(sections=sections), report=report)
+
+
+def _compile_normalized_with_stats(register, forgiveness, stats):
+    start = time.perf_counter()
+    sections = _sort_sections(register.sections)
+    stats.add_time('transform', time.perf_counter() - start)
+
+    if forgiveness:
+        start = time.perf_counter()
+        sections, report = _forgive(sections, register.width)
+        stats.add_time('forgive', time.perf_counter() - start)
+        for kind, name, position, size, winner in report:
+            if kind == 'dropped':
+                stats.count('redefinitions dropped')
+            elif kind == 'clipped':
+                stats.count('sections clipped')
             else:
-                if s['position'] in expands:
-                    old = expands[s['position']]
-                    section_space = old
-            sections.append(s['name'] + ' ' * section_space)
-        sections = ' | '.join(sections)
-        sections = '| ' + sections + ' |'
-
-    title = '| {name}{space}{address} |'.format(
-        name=reg['name'],
-        address=reg['address'],
-        space=' ' * (title_space + extra_title_space)
+                stats.count('holes filled', size)
+    else:
+        report = ()
+
+    start = time.perf_counter()
+    _validate_section_position(sections, forgiveness)
+    _validate_section_size(sections, register.width, forgiveness)
+    stats.add_time('validate', time.perf_counter() - start)
+
+    start = time.perf_counter()
+    layout = _build_layout(register._replace(sections=sections), stats, report)
+    stats.add_time('solve', time.perf_counter() - start)
+    stats.count('sections', len(layout.sections))
+    return layout
+
+
+def _build_layout(register, stats=None, report=()):
+    sections = register.sections
+    show_sections = not register.implicit and len(sections) >= 1
+    expands, extra_width, sections_row = _solve_columns(sections, {}, show_sections)
+    bits = _generate_bits(register.width, expands)
+    if stats is not None:
+        stats.count('expansions', len(expands))
+
+    return Layout(
+        name=register.name,
+        address=register.address,
+        width=register.width,
+        sections=sections,
+        implicit=register.implicit,
+        rows=(extra_width, sections_row, bits),
+        fields=tuple((s.position, (1 << s.size) - 1) for s in sections),
+        index=_build_index(sections),
+        report=report
     )
 
-    bits = _generate_bits(reg, expands)
 
-    header = '/*{line}-#'.format(
-        line='-' * global_width
-    )
+def _build_index(sections):
+    slots = [slot for slot in reversed(range(len(sections))) if sections[slot].size > 0]
+    slots.sort(key=lambda slot: sections[slot].position)
+    return tuple(sections[slot].position for slot in slots), tuple(slots)
 
-    divider = '#-{line}-#'.format(
-        line='-' * global_width
-    )
 
-    footer = '#-{line}*/'.format(
-        line='-' * global_width
+def _fingerprint(register, forgiveness):
+    return (
+        register.name,
+        register.address,
+        register.width,
+        tuple(sorted(register.sections)),
+        bool(forgiveness)
     )
 
+
+class Stats(object):
+    def __init__(self):
+        self.times = OrderedDict()
+        self.counts = OrderedDict()
+
+    def add_time(self, phase, seconds):
+        calls, total = self.times.get(phase, (0, 0.0))
+        self.times[phase] = (calls + 1, total + seconds)
+
+    def count(self, name, value=1):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def merge(self, other):
+        for phase, (calls, total) in other.times.items():
+            old_calls, old_total = self.times.get(phase, (0, 0.0))
+            self.times[phase] = (old_calls + calls, old_total + total)
+        for name, value in other.counts.items():
+            self.count(name, value)
+
+    def table(self):
+        total = sum(seconds for _, seconds in self.times.values()) or 1.0
+        lines = ['{:<12}{:>10}{:>14}{:>12}{:>8}'.format('phase', 'calls', 'total ms', 'mean us', 'share')]
+        for phase, (calls, seconds) in self.times.items():
+            lines.append('{:<12}{:>10}{:>14.3f}{:>12.2f}{:>7.1f}%'.format(
+                phase, calls, seconds * 1000, seconds / calls * 1000000, seconds / total * 100))
+        for name, value in self.counts.items():
+            lines.append('{:<24}{:>10}'.format(name, value))
+        if self.counts.get('registers') and 'layouts reused' in self.counts:
+            ratio = self.counts['layouts reused'] / self.counts['registers'] * 100
+            lines.append('{:<24}{:>9.1f}%'.format('dedup ratio', ratio))
+        return '\n'.join(lines) + '\n'
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache(object):
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+_default_cache = LRUCache()
+
+
+_disk_caches = {}
+
+
+def _environment_cache():
+    path = os.environ.get('REGART_CACHE_DIR')
+    if not path:
+        return None
+    if path not in _disk_caches:
+        max_size = os.environ.get('REGART_CACHE_SIZE')
+        _disk_caches[path] = DiskCache(path, int(max_size) if max_size else None)
+    return _disk_caches[path]
+
+
+def cache_info():
+    return _default_cache.info()
+
+
+def cache_clear():
+    _default_cache.clear()
+
+
+def cache_resize(maxsize):
+    _default_cache.resize(maxsize)
+
+
+VALUE_FORMATS = {
+    'hex': ('hex',),
+    'bin': ('bin',),
+    'both': ('hex', 'bin')
+}
+
+
+class Layout(namedtuple('Layout', ['name', 'address', 'width', 'sections', 'implicit', 'rows', 'fields', 'index',
+                                       'report'])):
+    __slots__ = ()
+
+    def render(self, name=None, address=None, value=None, value_format='hex'):
+        return ''.join(self.iter_lines(name, address, value, value_format))
+
+    def render_to(self, stream, name=None, address=None, value=None, value_format='hex'):
+        for line in self.iter_lines(name, address, value, value_format):
+            stream.write(line)
+
+    def field_at(self, bit):
+        bit = normalize_to_int(bit, 'bit')
+        starts, slots = self.index
+        i = bisect_right(starts, bit) - 1
+        if i < 0 or bit >= self.width:
+            return None
+        section = self.sections[slots[i]]
+        if bit >= section.position + section.size:
+            return None
+        return section
+
+    def fields_in_range(self, lo, hi):
+        lo = normalize_to_int(lo, 'lo')
+        hi = normalize_to_int(hi, 'hi')
+        if lo > hi:
+            lo, hi = hi, lo
+        starts, slots = self.index
+        first = max(bisect_right(starts, lo) - 1, 0)
+        last = bisect_right(starts, hi)
+        found = [
+            slot for slot in slots[first:last]
+            if self.sections[slot].position + self.sections[slot].size > lo
+        ]
+        return [self.sections[slot] for slot in sorted(found)]
+
+    def decode(self, value):
+        value = normalize_to_int(value, 'value')
+        if value < 0 or value >> self.width:
+            raise ValueError('Value does not fit into the register width.')
+        return [(value >> shift) & mask for shift, mask in self.fields]
+
+    def decode_array(self, values):
+        import numpy
+        values = numpy.asarray(values)
+        if values.dtype.kind == 'i':
+            values = values.view(values.dtype.str.replace('i', 'u'))
+        elif values.dtype.kind not in 'uO':
+            raise ValueError('Values have to be an integer array.')
+        if values.dtype.kind == 'u':
+            if self.width > values.dtype.itemsize * 8:
+                raise ValueError('Value array is too narrow for the register width.')
+            if self.width < values.dtype.itemsize * 8 and (values >> values.dtype.type(self.width)).any():
+                raise ValueError('Value does not fit into the register width.')
+        elif ((values < 0) | (values >> self.width != 0)).any():
+            raise ValueError('Value does not fit into the register width.')
+        result = OrderedDict()
+        for section, (shift, mask) in zip(self.sections, self.fields):
+            if section.name == '-':
+                continue
+            if values.dtype.kind == 'O':
+                result[section.name] = (values >> shift) & mask
+            else:
+                field = (values >> values.dtype.type(shift)) & values.dtype.type(mask)
+                result[section.name] = field.astype(numpy.min_scalar_type(mask))
+        return result
+
+    def iter_lines(self, name=None, address=None, value=None, value_format='hex'):
+        if value is not None:
+            if value_format not in VALUE_FORMATS:
+                raise ValueError('Value format has to be one of: hex, bin, both.')
+            value = normalize_to_int(value, 'value')
+            values = self.decode(value)
+        if name is None:
+            name = self.name
+        if address is None:
+            address = self.address
+        else:
+            address = _normalize_address(address)
+
+        title_min_width = len(name) + len(address) + 1
+        global_width = _default_width_for_size(self.width)
+        diff = global_width - title_min_width
+        if diff < 0:
+            expands = {0: -diff}
+            title_space = 1
+            global_width = title_min_width
+        else:
+            expands = {}
+            title_space = diff + 1
+
+        show_sections = not self.implicit and len(self.sections) >= 1 and name != self.sections[0][0]
+        if not expands and show_sections != self.implicit:
+            extra_width, sections, bits = self.rows
+        else:
+            expands, extra_width, sections = _solve_columns(self.sections, expands, show_sections)
+            bits = _generate_bits(self.width, expands)
+        global_width += extra_width
+
+        line = '-' * global_width
+        divider = '#-{line}-#\n'.format(line=line)
+
+        yield '/*{line}-#\n'.format(line=line)
+        yield '| {name}{space}{address} |\n'.format(
+            name=name,
+            address=address,
+            space=' ' * (title_space + extra_width)
+        )
+        yield divider
+        if sections is not None:
+            yield sections + '\n'
+            yield divider
+        yield bits + '\n'
+        if value is not None:
+            if sections is not None:
+                cells = [(len(cell), s.size) for cell, s in zip(sections[2:-2].split(' | '), self.sections)]
+            else:
+                cells = [(global_width, self.width)]
+                values = [value]
+            yield divider
+            for fmt in VALUE_FORMATS[value_format]:
+                yield _value_row(cells, values, fmt) + '\n'
+        yield '#-{line}*/\n'.format(line=line)
+
+
+def _value_row(cells, values, fmt):
+    row = []
+    for (cell_width, size), value in zip(cells, values):
+        text = _field_format(size, fmt).format(value)
+        row.append(text + ' ' * (cell_width - len(text)))
+    return '| ' + ' | '.join(row) + ' |'
+
+
+def _field_format(size, fmt):
+    if size == 1:
+        return '{}'
+    elif fmt == 'hex':
+        return '0x{{:0{}X}}'.format((size + 3) // 4)
+    else:
+        return '{{:0{}b}}'.format(size)
+
+
+def _solve_columns(sections, expands, show_sections):
+    expands = dict(expands)
+    extra_width = 0
+    if not show_sections:
+        return expands, extra_width, None
+    row = []
+    for name, position, size in sections:
+        section_space = _default_width_for_size(size) - len(name)
+        if section_space < 0:
+            if position in expands:
+                old = expands[position]
+                section_space = old
+                extra_width += max(-section_space, old)
+                expands[position] += max(-section_space, old)
+            else:
+                extra_width += -section_space
+                expands[position] = -section_space
+        else:
+            if position in expands:
+                old = expands[position]
+                section_space = old
+        row.append(name + ' ' * section_space)
+    row = ' | '.join(row)
+    row = '| ' + row + ' |'
+    return expands, extra_width, row
+
+
+def generate_many(regs, forgiveness=False, workers=None, chunksize=1, stats=None):
+    return list(_iter_many(regs, forgiveness, workers, chunksize, stats))
+
+
+def _iter_many(regs, forgiveness=False, workers=None, chunksize=1, stats=None):
+    if workers == 1:
+        layouts = LRUCache()
+        for reg in regs:
+            yield _generate_item(reg, forgiveness, stats, layouts)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in _chunked(regs, chunksize):
+            pending.append(executor.submit(_generate_chunk, chunk, forgiveness, stats is not None))
+            if len(pending) >= 2 * workers:
+                for result in _chunk_results(pending.popleft(), stats):
+                    yield result
+        while pending:
+            for result in _chunk_results(pending.popleft(), stats):
+                yield result
+
+
+def _chunk_results(future, stats):
+    results, chunk_stats = future.result()
+    if stats is not None:
+        stats.merge(chunk_stats)
+    return results
+
+
+def _chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _generate_chunk(regs, forgiveness, collect_stats=False):
+    stats = Stats() if collect_stats else None
+    layouts = LRUCache()
+    return [_generate_item(reg, forgiveness, stats, layouts) for reg in regs], stats
+
+
+def _generate_item(reg, forgiveness, stats=None, layouts=None):
     try:
-        return '\n'.join([header, title, divider, sections, divider, bits, footer]) + '\n'
-    except NameError:
-        return '\n'.join([header, title, divider, bits, footer]) + '\n'
+        if layouts is None:
+            return generate(reg, forgiveness, stats=stats)
+        cache = _environment_cache()
+        if not cache:
+            return _render(_compile_interned(reg, forgiveness, layouts, stats), stats)
+        register = _normalize(reg, stats)
+        key = _fingerprint(register, forgiveness)
+        result = cache.get(key)
+        if result is None:
+            result = _render(_intern_normalized(register, forgiveness, layouts, stats), stats)
+            cache.put(key, result)
+        elif stats is not None:
+            stats.count('cache hits')
+        return result
+    except Exception as e:
+        return e
+
+
+def _compile_interned(reg_in, forgiveness, layouts, stats=None):
+    return _intern_normalized(_normalize(reg_in, stats), forgiveness, layouts, stats)
+
+
+def _intern_normalized(register, forgiveness, layouts, stats=None):
+    key = _shape(register, forgiveness)
+    layout = layouts.get(key)
+    if layout is None:
+        layout = _compile_normalized(register, forgiveness, stats)
+        layouts.put(key, layout)
+    elif stats is not None:
+        stats.count('layouts reused')
+    if register.implicit:
+        return layout._replace(name=register.name, address=register.address, sections=register.sections)
+    return layout._replace(name=register.name, address=register.address)
+
+
+def _shape(register, forgiveness):
+    sections = () if register.implicit else tuple(sorted(register.sections))
+    return register.width, sections, register.implicit, bool(forgiveness)
 
 
 def _normalize_fields(reg):
-    if 'name' not in reg:
-        reg['name'] = 'REG'
-    if 'address' in reg:
-        reg['address'] = normalize_to_hex(reg['address'], 'address')
-        reg['address'] = '0x' + reg['address'][2:].upper()
+    name = reg.get('name', 'REG')
+    address = _normalize_address(reg['address']) if 'address' in reg else ''
     if 'width' not in reg:
-        reg['width'] = 8
+        width = 8
     else:
-        reg['width'] = normalize_to_int(reg['width'], 'width')
+        width = normalize_to_int(reg['width'], 'width')
     if 'sections' not in reg:
-        reg['sections'] = {
-            reg['name']: {
-                'position': 0,
-                'size': reg['width']
-            }
-        }
-    else:
-        for section_name in reg['sections']:
-            section = reg['sections'][section_name]
-            section['position'] = normalize_to_int(section['position'], 'position')
-            section['size'] = normalize_to_int(section['size'], 'size')
-
-
-def _remove_redefined_positions(reg):
-    current_position = reg['sections'][0]['position']
-    position_found = False
-    deletable_names = []
-    for section in reg['sections']:
-        if section['position'] == current_position:
-            if not position_found:
-                position_found = True
-            else:
-                deletable_names.append(section['name'])
-        else:
-            current_position = section['position']
-            position_found = False
-            if section['position'] == current_position:
-                position_found = True
-    temp = []
-    for section in reg['sections']:
-        if section['name'] not in deletable_names:
-            temp.append(section)
-
-    reg['sections'] = temp
-
-
-def _transform_sections(reg, forgiveness=False):
-    if 'sections' in reg:
-        _convert_dict_to_list(reg)
-        reg['sections'].sort(key=lambda s: s['name'])
-        reg['sections'].sort(key=lambda s: s['size'])
-        reg['sections'].sort(key=lambda s: s['position'], reverse=True)
-        if forgiveness:
-            _remove_redefined_positions(reg)
-            _fill_position_holes(reg)
-
-
-def _convert_dict_to_list(reg):
-    temp = []
-    for section_name in reg['sections']:
-        section = reg['sections'][section_name]
-        try:
-            temp.append({
-                'name': section_name,
-                'position': section['position'],
-                'size': section['size']
-            })
-        except ValueError:
-            raise ValueError('Invalid section parameters.')
-    reg['sections'] = temp
-
-
-def _fill_position_holes(reg):
-    position_list = list(range(reg['width']))
-    for s in reg['sections']:
-        position = s['position']
-        size = s['size']
-        positions = list(range(position, position + size))
-        for p in positions:
-            position_list = [pos for pos in position_list if pos != p]
-    for pos in position_list:
-        reg['sections'].append({
-            'name': '-',
-            'position': pos,
-            'size': 1
-        })
-    reg['sections'].sort(key=lambda s: s['position'], reverse=True)
+        return Register(name, address, width, (Section(name, 0, width),), True)
+    sections = tuple(
+        Section(
+            section_name,
+            normalize_to_int(section['position'], 'position'),
+            normalize_to_int(section['size'], 'size')
+        ) for section_name, section in reg['sections'].items()
+    )
+    return Register(name, address, width, sections, False)
+
+
+def _normalize_address(address):
+    address = normalize_to_hex(address, 'address')
+    return '0x' + address[2:].upper()
+
+
+def _transform_sections(register, forgiveness=False):
+    sections = _sort_sections(register.sections)
+    if forgiveness:
+        sections, _ = _forgive(sections, register.width)
+    return register._replace(sections=sections)
+
+
+def _sort_sections(sections):
+    return tuple(sorted(sections, key=lambda s: (-s.position, s.size, s.name)))
+
+
+Resolution = namedtuple('Resolution', ['kind', 'name', 'position', 'size', 'winner'])
+
+
+_fillers = ()
+
+
+def _filler_sections(width):
+    global _fillers
+    fillers = _fillers
+    if len(fillers) < width:
+        fillers = tuple(Section('-', position, 1) for position in range(max(width, 2 * len(fillers))))
+        _fillers = fillers
+    return fillers
+
+
+def _forgive(sections, width):
+    fillers = _filler_sections(width)
+    kept = []
+    report = []
+    floor = width
+    winner = None
+    for s in sections:
+        if s.size <= 0:
+            kept.append(s)
+            continue
+        if s.position >= floor:
+            report.append(Resolution('dropped', s.name, s.position, s.size, winner))
+            continue
+        top = s.position + s.size
+        if top > floor:
+            report.append(Resolution('clipped', s.name, floor, top - floor, winner))
+            s = Section(s.name, s.position, floor - s.position)
+        elif top < floor:
+            report.append(Resolution('filled', '-', top, floor - top, None))
+            kept.extend(reversed(fillers[top:floor]))
+        kept.append(s)
+        floor = s.position
+        winner = s.name
+    if floor > 0:
+        report.append(Resolution('filled', '-', 0, floor, None))
+        kept.extend(reversed(fillers[:floor]))
+    return tuple(kept), tuple(report)
 
 
 def _default_width_for_size(size):
@@ -171,9 +638,9 @@ def _default_width_for_size(size):
         return (size * 4) - 3 + (size - 10)
 
 
-def _generate_bits(reg, expands):
+def _generate_bits(width, expands):
     bits = ''
-    for i in reversed(range(reg['width'])):
+    for i in reversed(range(width)):
         if i in expands:
             bits += '| {} {}'.format(i, ' ' * expands[i])
         else:
@@ -183,30 +650,88 @@ def _generate_bits(reg, expands):
     return bits
 
 
-def _validate_section_size(reg, forgiveness):
+def _validate_section_size(sections, width, forgiveness):
     if not forgiveness:
         size_sum = 0
-        for s in reg['sections']:
-            size_sum += s['size']
-        if size_sum < reg['width']:
+        for s in sections:
+            size_sum += s.size
+        if size_sum < width:
             raise ValueError('Sections do not fill the register width.')
-        elif size_sum > reg['width']:
+        elif size_sum > width:
             raise ValueError('Sections size exceed the register width.')
 
 
-def _validate_section_position(reg, forgiveness):
+def _validate_section_position(sections, forgiveness):
     if not forgiveness:
-        position_map = []
-        for s in reg['sections']:
-            pos = s['position']
-            if s['size'] > 1:
-                positions = list(range(pos, pos + s['size']))
-            else:
-                positions = [pos]
-            for pos in positions:
-                if pos in position_map:
+        covered = None
+        for s in reversed(sections):
+            if s.size > 0:
+                if covered is not None and s.position < covered:
                     raise ValueError('Section position redefined.')
-            position_map.extend(positions)
+                covered = s.position + s.size
+
+
+Violation = namedtuple('Violation', ['register', 'section', 'lo', 'hi', 'kind', 'message'])
+
+
+def _collect_violations(reg, forgiveness):
+    name = reg.get('name', 'REG')
+    violations = []
+    try:
+        if 'address' in reg:
+            _normalize_address(reg['address'])
+    except (ValueError, TypeError) as e:
+        violations.append(Violation(name, None, None, None, 'value', str(e)))
+    try:
+        width = normalize_to_int(reg['width'], 'width') if 'width' in reg else 8
+    except (ValueError, TypeError) as e:
+        violations.append(Violation(name, None, None, None, 'value', str(e)))
+        return violations
+    sections = []
+    for section_name, section in reg.get('sections', {}).items():
+        try:
+            sections.append(Section(
+                section_name,
+                normalize_to_int(section['position'], 'position'),
+                normalize_to_int(section['size'], 'size')
+            ))
+        except KeyError as e:
+            message = 'Section is missing the "{}" key.'.format(e.args[0])
+            violations.append(Violation(name, section_name, None, None, 'value', message))
+        except (ValueError, TypeError) as e:
+            violations.append(Violation(name, section_name, None, None, 'value', str(e)))
+    if forgiveness or 'sections' not in reg or violations:
+        return violations
+    return violations + _collect_layout_violations(name, sections, width)
+
+
+def _collect_layout_violations(name, sections, width):
+    violations = []
+    size_sum = sum(s.size for s in sections)
+    covered = None
+    for s in sorted(sections, key=lambda s: (s.position, -s.size, s.name)):
+        if s.size <= 0:
+            continue
+        end = s.position + s.size
+        start = 0 if covered is None else max(covered, 0)
+        if covered is not None and s.position < covered:
+            violations.append(Violation(
+                name, s.name, s.position, min(covered, end) - 1, 'overlap', 'Section position redefined.'))
+        elif start < s.position and start < width and size_sum < width:
+            violations.append(Violation(
+                name, None, start, min(s.position, width) - 1, 'gap', 'Sections do not fill the register width.'))
+        if s.position < 0 and size_sum > width:
+            violations.append(Violation(
+                name, s.name, s.position, min(end, 0) - 1, 'overflow', 'Sections size exceed the register width.'))
+        if end > width and size_sum > width:
+            violations.append(Violation(
+                name, s.name, max(s.position, width), end - 1, 'overflow', 'Sections size exceed the register width.'))
+        covered = end if covered is None else max(covered, end)
+    start = 0 if covered is None else max(covered, 0)
+    if start < width and size_sum < width:
+        violations.append(Violation(
+            name, None, start, width - 1, 'gap', 'Sections do not fill the register width.'))
+    return violations
 
 
 def normalize_to_hex(value, name):
@@ -227,6 +752,8 @@ def normalize_to_hex(value, name):
 
 
 def normalize_to_int(value, name):
+    if type(value) is int:
+        return value
     try:
         if not value.startswith('0x'):
             try:
@@ -1,242 +1,306 @@
+import os
 import sys
-import re
-import pydoc
-from termcolor import colored
-from pkg_resources import get_distribution
-from regart import generate
-
-__version__ = get_distribution('regart').version
-
-HELP = '''\
-===============================================================================
-                                 R E G A R T
--------------------------------------------------------------------------------
-                       by Tibor Simon - tiborsimon.io
-===============================================================================
-
- The responsive register drawing command line tool.
-
- Press q to exit this manual.
-
- Usage:
-    regart
-    regart (-n|--name) <name>
-    regart (-a|--address) <address>
-    regart (-w|--width) <width>
-    regart (-s|-section) <section_string> ...
-    regart (-h|--help)
-    regart (-v|--version)
-    regart (-f|--forgive)
-
- Options:
-    -n --name      Name of the register. Default: REG.
-    -a --address   Register address. By default there is no address defined.
-    -w --width     Register width. Default is 8.
-    -s --section   Section definition string. Syntax: "name@from:to"
-    -h --help      Prints out this help.
-    -v --version   Prints out the version number.
-    -f --forgive   Allows position redefinition. Firs section will be kept.
-
-
-
- All previously described options are optional. If you did not specify any 
- parameter, an empty register will be printed out:
- 
- $ regart
- /*------------------------------#
- | REG                           |
- #-------------------------------#
- | 7 | 6 | 5 | 4 | 3 | 2 | 1 | 0 |
- #------------------------------*/
-
- As you can see, the default name is REG and the default width is 8 bits. You
- can also notice that if there is no section defined, the register section row
- did not get printed.
-
- You can add name, address and different width to your register:
-
- $ regart --name REGA --address 0x120 --width 16
- /*--------------------------------------------------------------------#
- | REGA                                                          0x120 |
- #---------------------------------------------------------------------#
- | 15 | 14 | 13 | 12 | 11 | 10 | 9 | 8 | 7 | 6 | 5 | 4 | 3 | 2 | 1 | 0 |
- #--------------------------------------------------------------------*/
-
- These were the long named options. You can also use the short versions to
- save typing: $ regart -n REGA -a 0x120 -w 16
- The result will be the same.
-
- The address was given as a hexadecimal number, but you are free to use decimal
- numbers as well.
-
- For the register width the only limitation is your screen width :D
-
-
-
- Let's define some register sections!
-
- $ regart --section SECTION@0:7
- /*------------------------------#
- | REG                           |
- #-------------------------------#
- | SECTION                       |
- #-------------------------------#
- | 7 | 6 | 5 | 4 | 3 | 2 | 1 | 0 |
- #------------------------------*/
-
- There is a new row below the register name. This row is the register section
- definition row. We have defined a section named SECTION from bit 0 to bit 7
- with the following syntax: "name@from:to". You can also change direction of 
- the definition: "name@to:from". 
- 
- I you left out one of the position limit, the defined section will be added 
- as a one bit wide section.
-
- You can use the short section definition as well: $ regart -s SECTION@0:7
-
- Be careful, when you define sections. The defined sections have to fill the
- entire register width.
-
- The following definition is syntactically wrong:
-
- $ regart -s SECTION@0:5
- Sections do not fill the register width.
-
- The default register width is 8 bit. The defined section takes 6 bits, so the 
- last 2 bits are undefined. This is an error. You always have to define all
- bits in your registers.
-
-
- Let's see a fully defined 8 bit wide register:
-
- $ regart -n REGA -a 0x123 -s STATUS@7:5 -s CARRY@4 -s ENABLE@3 -s SUM@2:0
- /*---------------------------------------#
- | REGA                             0x123 |
- #----------------------------------------#
- | STATUS    | CARRY | ENABLE | SUM       |
- #----------------------------------------#
- | 7 | 6 | 5 | 4     | 3      | 2 | 1 | 0 |
- #---------------------------------------*/
-
- Sections are responsive, as they take up as much space as the needs to keep
- themselves aligned with their bits.
-
-
-
- You can use regart as a python module as well. The following example code will
- demonstrate the usage. It will prodice the same output as the previous 
- command:
-
- import regart
-
- reg = {
-     'name': 'REGA',
-     'address': '0x123',
-     'width': 8,
-     'sections': {
-         'STATUS': {
-             'position': 5,
-             'size': 3
-          },
-          'CARRY': {
-              'position': 4,
-              'size': 1
-          },
-          'ENABLE': {
-              'position': 3,
-              'size': 1
-          },
-          'SUM': {
-              'position': 0,
-              'size': 3
-          }
-     }
- }
-
- result = regart.generate(reg)
- print(result)
-
- As you can see, this is basically the same register description. The only
- difference is the way you define the sections. Instead of the from-to approach
- you define the lowest bit number and the section size.
-
- Every key in the reg dictionay is optional too. You can pass an empty 
- dictionary as well, and the default register art will be produced.
-
-
-
- The MIT License (MIT)
- 
- Copyright (c) 2016 Tibor Simon
- 
- Permission is hereby granted, free of charge, to any person obtaining a copy
- of this software and associated documentation files (the "Software"), to deal
- in the Software without restriction, including without limitation the rights
- to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
- copies of the Software, and to permit persons to whom the Software is
- furnished to do so, subject to the following conditions:
- 
- The above copyright notice and this permission notice shall be included in all
- copies or substantial portions of the Software.
- 
- THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
- IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
- FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
- AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
- LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
- OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
- SOFTWARE.
-'''
-
-reg = {}
-current_key = None
-forgiveness = False
-try:
-    for p in sys.argv[1:]:
-        if not current_key:
-            if p in ['-n', '--name']:
-                current_key = 'name'
-            if p in ['-a', '--address']:
-                current_key = 'address'
-            if p in ['-w', '--width']:
-                current_key = 'width'
-            if p in ['-s', '--section']:
-                current_key = 'section'
-            if p in ['-h', '--help']:
-                pydoc.pager(HELP)
-                sys.exit(0)
-            if p in ['-v', '--version']:
-                print('v{}'.format(__version__))
-                sys.exit(0)
-            if p in ['-f', '--forgive']:
-                forgiveness = True
+import time
+
+from regart import __version__, generate, validate, LRUCache, Stats, _compile_interned, _environment_cache, _iter_many
+
+
+def render_registers(regs, forgiveness, jobs, stats=None):
+    import itertools
+    failed = False
+    regs, names = itertools.tee(regs)
+    if jobs == 1:
+        layouts = LRUCache()
+        results = (_render_item(reg, forgiveness, stats, layouts) for reg in regs)
+    else:
+        results = _iter_many(regs, forgiveness, workers=jobs, chunksize=64, stats=stats)
+    for reg, result in zip(names, results):
+        if isinstance(result, Exception):
+            failed = True
+            sys.stdout.flush()
+            message = '{}: {}'.format(reg.get('name', 'REG'), result.args[0])
+            sys.stderr.write(_colored(message, 'red') + '\n')
+        elif result is not None:
+            sys.stdout.write(result + '\n')
+    return failed
+
+
+def _render_item(reg, forgiveness, stats, layouts):
+    try:
+        cache = _environment_cache()
+        if cache:
+            sys.stdout.write(generate(reg, forgiveness, cache=cache, stats=stats) + '\n')
+            return
+        layout = _compile_interned(reg, forgiveness, layouts, stats)
+        if stats is None:
+            layout.render_to(sys.stdout)
         else:
-            if current_key == 'section':
-                if 'sections' not in reg:
-                    reg['sections'] = {}
-                m = re.match('^(\w+)@(\d+)(?::(\d+))?$', p)
-                if m:
-                    name = m.group(1)
-                    a = int(m.group(2))
-                    if m.group(3):
-                        b = int(m.group(3))
-                        pos = min(a, b)
-                        size = abs(a-b) + 1
+            start = time.perf_counter()
+            layout.render_to(sys.stdout)
+            stats.add_time('render', time.perf_counter() - start)
+        sys.stdout.write('\n')
+    except Exception as e:
+        return e
+
+
+def check_registers(regs, forgiveness):
+    checked = 0
+    errors = 0
+    for reg in regs:
+        checked += 1
+        for violation in validate(reg, forgiveness, collect=True):
+            errors += 1
+            print(format_violation(violation))
+    print('{} registers checked, {} errors'.format(checked, errors))
+    return errors > 0
+
+
+def format_violation(violation):
+    location = violation.register
+    if violation.section is not None:
+        location += '.' + violation.section
+    if violation.lo is not None:
+        location += ' [{}:{}]'.format(violation.hi, violation.lo)
+    return '{}: {} ({})'.format(location, violation.message, violation.kind)
+
+
+def export_registers(regs, path, index_path, forgiveness, jobs):
+    from regart.export import export
+    result = export(regs, path, index_path, forgiveness, workers=jobs)
+    for error in result.errors:
+        sys.stderr.write(_colored(str(error), 'red') + '\n')
+    print('{} registers exported, {} bytes written to {}'.format(result.exported, result.size, path))
+    return bool(result.errors)
+
+
+def select_range(regs, text):
+    from regart.regmap import RegisterMap
+    lo, separator, hi = text.partition(':')
+    if not separator or not lo or not hi:
+        raise ValueError('Value for key "range" has to be in the LO:HI format.')
+    return RegisterMap(regs).in_range(lo, hi)
+
+
+def import_database(path, regs, forgiveness):
+    from regart.db import import_registers
+    result = import_registers(path, regs, forgiveness)
+    for error in result.errors:
+        sys.stderr.write(_colored(str(error), 'red') + '\n')
+    print('{} registers imported, {} rendered, {} unchanged'.format(
+        result.imported, result.rendered, result.unchanged))
+    return bool(result.errors)
+
+
+def query_database(path, name, address):
+    from regart.db import find
+    records = find(path, name, address)
+    for record in records:
+        sys.stdout.write(record.art + '\n')
+    if not records:
+        sys.stderr.write(_colored('No matching register.', 'red') + '\n')
+    return not records
+
+
+def decode_registers(regs, forgiveness, jobs, value_format, as_json):
+    from regart.trace import build_index, decode_stream
+    errors = []
+    index = build_index(regs, forgiveness, value_format, errors)
+    for error in errors:
+        sys.stderr.write(_colored(str(error), 'red') + '\n')
+    decode_stream(sys.stdin, sys.stdout, index, as_json, workers=jobs)
+    return bool(errors)
+
+
+def update_headers(paths):
+    from regart.header import update_file
+    failed = False
+    for path in paths:
+        try:
+            result = update_file(path)
+        except Exception as e:
+            failed = True
+            sys.stderr.write(_colored(str(e), 'red') + '\n')
+            continue
+        print('{}: {} rendered, {} unchanged'.format(path, result.rendered, result.unchanged))
+    return failed
+
+
+def update_headers_in_tree(root, jobs):
+    from regart.header import update_tree
+    result = update_tree(root, workers=jobs)
+    for error in result.errors:
+        sys.stderr.write(_colored(str(error), 'red') + '\n')
+    print('{} files scanned, {} files updated, {} blocks rendered, {} blocks unchanged'.format(
+        result.scanned, result.updated, result.rendered, result.unchanged))
+    return bool(result.errors)
+
+
+def render_register(reg, forgiveness, stats=None, value=None, value_format='hex'):
+    path = os.environ.get('REGART_SOCKET')
+    if path and os.path.exists(path) and stats is None and value is None:
+        from regart.server import request
+        try:
+            return request(path, reg, forgiveness)
+        except (IOError, OSError):
+            pass
+    return generate(reg, forgiveness, stats=stats, value=value, value_format=value_format)
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    reg = {}
+    options = {}
+    current_key = None
+    forgiveness = False
+    stats = None
+    try:
+        for p in argv:
+            if not current_key:
+                if p in ['-n', '--name']:
+                    current_key = 'name'
+                if p in ['-a', '--address']:
+                    current_key = 'address'
+                if p in ['-w', '--width']:
+                    current_key = 'width'
+                if p in ['-s', '--section']:
+                    current_key = 'section'
+                if p in ['-m', '--map']:
+                    current_key = 'map'
+                if p in ['-j', '--jobs']:
+                    current_key = 'jobs'
+                if p in ['--svd']:
+                    current_key = 'svd'
+                if p in ['-p', '--peripheral']:
+                    current_key = 'peripheral'
+                if p in ['-u', '--update']:
+                    current_key = 'update'
+                if p in ['--update-tree']:
+                    current_key = 'update-tree'
+                if p in ['--serve']:
+                    current_key = 'serve'
+                if p in ['-o', '--output']:
+                    current_key = 'output'
+                if p in ['--index']:
+                    current_key = 'index'
+                if p in ['--db']:
+                    current_key = 'db'
+                if p in ['-r', '--range']:
+                    current_key = 'range'
+                if p in ['--value']:
+                    current_key = 'value'
+                if p in ['--value-format']:
+                    current_key = 'value-format'
+                if p in ['-h', '--help']:
+                    import pydoc
+                    from regart._help import HELP
+                    pydoc.pager(HELP)
+                    sys.exit(0)
+                if p in ['-v', '--version']:
+                    print('v{}'.format(__version__))
+                    sys.exit(0)
+                if p in ['-f', '--forgive']:
+                    forgiveness = True
+                if p in ['--profile']:
+                    stats = Stats()
+                if p in ['--decode-stream']:
+                    options['decode-stream'] = True
+                if p in ['--json']:
+                    options['json'] = True
+                if p in ['--check']:
+                    options['check'] = True
+            else:
+                if current_key == 'section':
+                    if 'sections' not in reg:
+                        reg['sections'] = {}
+                    import re
+                    m = re.match('^(\w+)@(\d+)(?::(\d+))?$', p)
+                    if m:
+                        name = m.group(1)
+                        a = int(m.group(2))
+                        if m.group(3):
+                            b = int(m.group(3))
+                            pos = min(a, b)
+                            size = abs(a-b) + 1
+                        else:
+                            pos = a
+                            size = 1
+
+                        reg['sections'][name] = {
+                            'position': pos,
+                            'size': size
+                        }
                     else:
-                        pos = a
-                        size = 1
-
-                    reg['sections'][name] = {
-                        'position': pos,
-                        'size': size
-                    }
+                        raise SyntaxError('Invalid section syntax!')
+                elif current_key in ['map', 'jobs', 'svd', 'peripheral', 'update-tree', 'serve', 'value',
+                                     'value-format', 'output', 'index', 'db', 'range']:
+                    options[current_key] = p
+                elif current_key == 'update':
+                    options.setdefault('update', []).append(p)
                 else:
-                    raise SyntaxError('Invalid section syntax!')
+                    reg[current_key] = p
+                current_key = None
+        try:
+            jobs = int(options.get('jobs', 1))
+        except ValueError:
+            raise ValueError('Value for key "jobs" has to be an integer.')
+        if 'serve' in options:
+            from regart.server import serve
+            try:
+                serve(options['serve'])
+            except KeyboardInterrupt:
+                pass
+            sys.exit(0)
+        if 'update' in options:
+            if update_headers(options['update']):
+                sys.exit(1)
+            sys.exit(0)
+        if 'update-tree' in options:
+            if update_headers_in_tree(options['update-tree'], jobs):
+                sys.exit(1)
+            sys.exit(0)
+        if 'map' in options or 'svd' in options:
+            if 'map' in options:
+                from regart.regmap import iter_map
+                regs = iter_map(options['map'])
             else:
-                reg[current_key] = p
-            current_key = None
-    print(generate(reg, forgiveness))
-except Exception as e:
-    print(colored(e.args[0], 'red'))
-    sys.exit(1)
-
+                from regart.svd import iter_registers
+                regs = iter_registers(options['svd'], options.get('peripheral'))
+            if 'range' in options:
+                regs = select_range(regs, options['range'])
+            if 'check' in options:
+                sys.exit(1 if check_registers(regs, forgiveness) else 0)
+            if 'db' in options:
+                sys.exit(1 if import_database(options['db'], regs, forgiveness) else 0)
+            if 'output' in options:
+                sys.exit(1 if export_registers(regs, options['output'], options.get('index'), forgiveness, jobs) else 0)
+            if 'decode-stream' in options:
+                failed = decode_registers(regs, forgiveness, jobs, options.get('value-format', 'hex'), 'json' in options)
+                sys.exit(1 if failed else 0)
+            failed = render_registers(regs, forgiveness, jobs, stats)
+            _print_stats(stats)
+            sys.exit(1 if failed else 0)
+        if 'check' in options:
+            sys.exit(1 if check_registers([reg], forgiveness) else 0)
+        if 'db' in options:
+            sys.exit(1 if query_database(options['db'], reg.get('name'), reg.get('address')) else 0)
+        print(render_register(reg, forgiveness, stats, options.get('value'), options.get('value-format', 'hex')))
+        _print_stats(stats)
+    except Exception as e:
+        print(_colored(e.args[0], 'red'))
+        sys.exit(1)
+
+
+def _print_stats(stats):
+    if stats is not None:
+        sys.stdout.flush()
+        sys.stderr.write(stats.table())
+
+
+def _colored(text, color):
+    from termcolor import colored
+    return colored(text, color)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+HELP = '''\
+===============================================================================
+                                 R E G A R T
+-------------------------------------------------------------------------------
+                       by Tibor Simon - tiborsimon.io
+===============================================================================
+
+ The responsive register drawing command line tool.
+
+ Press q to exit this manual.
+
+ Usage:
+    regart
+    regart (-n|--name) <name>
+    regart (-a|--address) <address>
+    regart (-w|--width) <width>
+    regart (-s|-section) <section_string> ...
+    regart (-h|--help)
+    regart (-v|--version)
+    regart (-f|--forgive)
+    regart (-m|--map) <file> [(-r|--range) <lo>:<hi>] [(-j|--jobs) <jobs>]
+    regart --svd <file> [(-p|--peripheral) <name>] [(-j|--jobs) <jobs>]
+    regart (-u|--update) <file> ...
+    regart --update-tree <directory> [(-j|--jobs) <jobs>]
+    regart (-m|--map) <file> (-o|--output) <file> [--index <file>]
+    regart --db <file> ((-m|--map) <file> | --svd <file>)
+    regart --db <file> [(-n|--name) <pattern>] [(-a|--address) <address>]
+    regart --check [(-m|--map) <file> | --svd <file>]
+    regart --decode-stream (-m|--map) <file> [--json] [(-j|--jobs) <jobs>]
+    regart --serve <socket>
+    regart ... --value <value> [--value-format (hex|bin|both)]
+    regart ... --profile
+
+ Options:
+    -n --name      Name of the register. Default: REG.
+    -a --address   Register address. By default there is no address defined.
+    -w --width     Register width. Default is 8.
+    -s --section   Section definition string. Syntax: "name@from:to"
+    -h --help      Prints out this help.
+    -v --version   Prints out the version number.
+    -f --forgive   Allows position redefinition. Firs section will be kept.
+    -m --map       Renders every register from a JSON or JSON Lines file.
+    -r --range     Renders only the map registers within an address range.
+    -j --jobs      Number of worker processes for batch operations.
+    --svd          Renders the registers of a CMSIS-SVD device file.
+    -p --peripheral  Renders only the matching peripherals of an SVD file.
+    -u --update    Updates the register art blocks in a source file.
+    --update-tree  Updates the register art blocks in every C source file of
+                   a directory tree.
+    --serve        Starts a render server listening on a Unix socket.
+    --value        Decodes a register value into the section fields.
+    --value-format Format of the decoded fields: hex, bin or both. Default: hex.
+    -o --output    Writes the rendered registers of a map into a single file.
+    --index        Writes the offset index of the --output file as JSON Lines.
+    --db           Imports registers into, or looks them up in an SQLite database.
+    --check        Reports every error of the registers without rendering them.
+    --decode-stream  Decodes "address=value" lines of the standard input.
+    --json         Prints the decoded lines as JSON Lines.
+    --profile      Prints the time spent in each rendering phase.
+
+
+
+ All previously described options are optional. If you did not specify any 
+ parameter, an empty register will be printed out:
+ 
+ $ regart
+ /*------------------------------#
+ | REG                           |
+ #-------------------------------#
+ | 7 | 6 | 5 | 4 | 3 | 2 | 1 | 0 |
+ #------------------------------*/
+
+ As you can see, the default name is REG and the default width is 8 bits. You
+ can also notice that if there is no section defined, the register section row
+ did not get printed.
+
+ You can add name, address and different width to your register:
+
+ $ regart --name REGA --address 0x120 --width 16
+ /*--------------------------------------------------------------------#
+ | REGA                                                          0x120 |
+ #---------------------------------------------------------------------#
+ | 15 | 14 | 13 | 12 | 11 | 10 | 9 | 8 | 7 | 6 | 5 | 4 | 3 | 2 | 1 | 0 |
+ #--------------------------------------------------------------------*/
+
+ These were the long named options. You can also use the short versions to
+ save typing: $ regart -n REGA -a 0x120 -w 16
+ The result will be the same.
+
+ The address was given as a hexadecimal number, but you are free to use decimal
+ numbers as well.
+
+ For the register width the only limitation is your screen width :D
+
+
+
+ Let's define some register sections!
+
+ $ regart --section SECTION@0:7
+ /*------------------------------#
+ | REG                           |
+ #-------------------------------#
+ | SECTION                       |
+ #-------------------------------#
+ | 7 | 6 | 5 | 4 | 3 | 2 | 1 | 0 |
+ #------------------------------*/
+
+ There is a new row below the register name. This row is the register section
+ definition row. We have defined a section named SECTION from bit 0 to bit 7
+ with the following syntax: "name@from:to". You can also change direction of 
+ the definition: "name@to:from". 
+ 
+ I you left out one of the position limit, the defined section will be added 
+ as a one bit wide section.
+
+ You can use the short section definition as well: $ regart -s SECTION@0:7
+
+ Be careful, when you define sections. The defined sections have to fill the
+ entire register width.
+
+ The following definition is syntactically wrong:
+
+ $ regart -s SECTION@0:5
+ Sections do not fill the register width.
+
+ The default register width is 8 bit. The defined section takes 6 bits, so the 
+ last 2 bits are undefined. This is an error. You always have to define all
+ bits in your registers.
+
+
+ Let's see a fully defined 8 bit wide register:
+
+ $ regart -n REGA -a 0x123 -s STATUS@7:5 -s CARRY@4 -s ENABLE@3 -s SUM@2:0
+ /*---------------------------------------#
+ | REGA                             0x123 |
+ #----------------------------------------#
+ | STATUS    | CARRY | ENABLE | SUM       |
+ #----------------------------------------#
+ | 7 | 6 | 5 | 4     | 3      | 2 | 1 | 0 |
+ #---------------------------------------*/
+
+ Sections are responsive, as they take up as much space as the needs to keep
+ themselves aligned with their bits.
+
+
+
+ You can use regart as a python module as well. The following example code will
+ demonstrate the usage. It will prodice the same output as the previous 
+ command:
+
+ import regart
+
+ reg = {
+     'name': 'REGA',
+     'address': '0x123',
+     'width': 8,
+     'sections': {
+         'STATUS': {
+             'position': 5,
+             'size': 3
+          },
+          'CARRY': {
+              'position': 4,
+              'size': 1
+          },
+          'ENABLE': {
+              'position': 3,
+              'size': 1
+          },
+          'SUM': {
+              'position': 0,
+              'size': 3
+          }
+     }
+ }
+
+ result = regart.generate(reg)
+ print(result)
+
+ As you can see, this is basically the same register description. The only
+ difference is the way you define the sections. Instead of the from-to approach
+ you define the lowest bit number and the section size.
+
+ Every key in the reg dictionay is optional too. You can pass an empty 
+ dictionary as well, and the default register art will be produced.
+
+
+
+ If you have a lot of registers, you can collect them into a register map file
+ and render all of them with a single command. The file can either be a JSON
+ list of register dictionaries, or a JSON Lines file with one register
+ dictionary per line:
+
+ $ regart --map registers.json --jobs 8
+
+ Registers are rendered in the order of the file. Invalid registers are
+ reported on the standard error and the rest of the map is still rendered.
+
+ Vendor CMSIS-SVD device files can be rendered directly as well. You can select
+ peripherals by name, wildcards are allowed. SVD registers usually have
+ reserved bits, so you might want to use the forgiveness mode:
+
+ $ regart --svd device.svd --peripheral 'UART*' -f
+
+
+
+ Register art blocks pasted into C headers can be kept in sync with their
+ definition. Put a marker comment with the register definition in front of
+ the block:
+
+ /* regart: {"name": "REGA", "width": 8, "forgiveness": true} */
+
+ $ regart --update registers.h
+
+ The register art is rendered below the marker, and the hash of the definition
+ is saved into the marker. Next time only the blocks with a changed definition
+ are rendered again. Files without changes are not written.
+
+ You can update every C source and header file in a whole source tree at once:
+
+ $ regart --update-tree src --jobs 8
+
+
+
+ If you call regart very frequently, e.g. from an editor integration, you can
+ start a resident render server on a Unix socket:
+
+ $ regart --serve /tmp/regart.sock
+
+ If the REGART_SOCKET environment variable points to the socket of a running
+ server, regart forwards single register renders to the server.
+
+
+
+ To lint a register map without rendering it, use --check. Every error of
+ every register is reported in one pass:
+
+ $ regart --check --map registers.json
+ UART0_CR [7:4]: Sections do not fill the register width. (gap)
+ 2048 registers checked, 1 errors
+
+
+
+ If you have a raw register value, e.g. from a memory dump, the --value option
+ decodes it into the section fields. Use --value-format to print the fields in
+ hex (default), bin or both formats:
+
+ $ regart -n CTRL -s DATA@7:4 -s MODE@3:1 -s EN@0 --value 0xA5
+ /*-------------------------------#
+ | CTRL                           |
+ #--------------------------------#
+ | DATA          | MODE      | EN |
+ #--------------------------------#
+ | 7 | 6 | 5 | 4 | 3 | 2 | 1 | 0  |
+ #--------------------------------#
+ | 0xA           | 0x2       | 1  |
+ #-------------------------------*/
+
+
+
+ Hardware trace logs with "address=value" lines can be decoded against a
+ register map. Lines with an unknown address are passed through unchanged. Use
+ --json to get JSON Lines output:
+
+ $ regart --decode-stream --map registers.json < trace.log
+ CTRL 0x40001000=0xDEADBEEF DATA=0xDEAD MODE=0x7 EN=1
+
+
+
+ If your renders are slow, the --profile switch prints a table with the time
+ spent in each rendering phase and the number of sections, filled holes and
+ column expansions after the run:
+
+ $ regart --map registers.json --profile
+
+
+
+ The MIT License (MIT)
+ 
+ Copyright (c) 2016 Tibor Simon
+ 
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+ 
+ The above copyright notice and this permission notice shall be included in all
+ copies or substantial portions of the Software.
+ 
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ SOFTWARE.
+'''
@@ -0,0 +1,100 @@
+import os
+
+
+class DiskCache(object):
+    def __init__(self, path, max_size=None):
+        from regart import __version__, RENDER_FORMAT
+        self.path = path
+        self.max_size = max_size
+        self.version = (__version__, RENDER_FORMAT)
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+    def get(self, key):
+        path = self._path_for(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read().decode('utf-8')
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.max_size is not None:
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+        return value
+
+    def put(self, key, value):
+        path = self._path_for(key)
+        directory = os.path.dirname(path)
+        data = value.encode('utf-8')
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+        import tempfile
+        fd, temp = tempfile.mkstemp(dir=directory, prefix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+        if self.max_size is not None:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data)
+            if self._size > self.max_size:
+                self.evict()
+
+    def evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry_size for _, entry_size, _ in entries)
+        limit = (self.max_size or 0) * 9 // 10
+        for path, entry_size, _ in entries:
+            if size <= limit:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            size -= entry_size
+        self._size = size
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _path_for(self, key):
+        import hashlib
+        digest = hashlib.sha1(repr((self.version, key)).encode('utf-8')).hexdigest()
+        return os.path.join(self.path, digest[:2], digest[2:])
+
+    def _entries(self):
+        if not os.path.isdir(self.path):
+            return
+        for shard in os.listdir(self.path):
+            directory = os.path.join(self.path, shard)
+            if len(shard) != 2 or not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if name.startswith('.tmp'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
@@ -0,0 +1,116 @@
+import sqlite3
+from collections import namedtuple
+
+from regart import generate, normalize_to_int, _normalize
+from regart.header import spec_hash
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS registers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    address INTEGER,
+    width INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    art TEXT NOT NULL,
+    UNIQUE (name, address)
+);
+CREATE INDEX IF NOT EXISTS registers_address ON registers (address);
+CREATE TABLE IF NOT EXISTS sections (
+    register_id INTEGER NOT NULL REFERENCES registers (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sections_register ON sections (register_id);
+CREATE INDEX IF NOT EXISTS sections_name ON sections (name);
+'''
+
+Record = namedtuple('Record', ['name', 'address', 'width', 'art'])
+
+ImportResult = namedtuple('ImportResult', ['imported', 'rendered', 'unchanged', 'errors'])
+
+
+def connect(path):
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA foreign_keys = ON')
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def import_registers(path, regs, forgiveness=False):
+    imported = rendered = unchanged = 0
+    errors = []
+    connection = connect(path)
+    try:
+        with connection:
+            hashes = dict(((name, address), digest) for name, address, digest in connection.execute(
+                'SELECT name, address, hash FROM registers'))
+            seen = set()
+            for reg in regs:
+                name = reg.get('name', 'REG')
+                try:
+                    register = _normalize(reg)
+                    key = (register.name, _address_of(register))
+                    if key in seen:
+                        raise ValueError('Register is defined more than once.')
+                    seen.add(key)
+                    digest = spec_hash(dict(reg, forgiveness=forgiveness))
+                    if hashes.get(key) == digest:
+                        unchanged += 1
+                    else:
+                        _store(connection, register, digest, generate(reg, forgiveness, cache=False))
+                        hashes[key] = digest
+                        rendered += 1
+                    imported += 1
+                except Exception as e:
+                    errors.append(ValueError('{}: {}'.format(name, e.args[0] if e.args else e)))
+    finally:
+        connection.close()
+    return ImportResult(imported, rendered, unchanged, errors)
+
+
+def find(path, name=None, address=None):
+    query = 'SELECT name, address, width, art FROM registers'
+    conditions = []
+    parameters = []
+    if name is not None:
+        conditions.append('name GLOB ?')
+        parameters.append(name)
+    if address is not None:
+        conditions.append('address = ?')
+        parameters.append(normalize_to_int(address, 'address'))
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += ' ORDER BY address, name'
+    connection = connect(path)
+    try:
+        return [Record(*row) for row in connection.execute(query, parameters)]
+    finally:
+        connection.close()
+
+
+def _store(connection, register, digest, art):
+    address = _address_of(register)
+    row = connection.execute(
+        'SELECT id FROM registers WHERE name = ? AND address IS ?', (register.name, address)).fetchone()
+    if row is None:
+        register_id = connection.execute(
+            'INSERT INTO registers (name, address, width, hash, art) VALUES (?, ?, ?, ?, ?)',
+            (register.name, address, register.width, digest, art)
+        ).lastrowid
+    else:
+        register_id = row[0]
+        connection.execute(
+            'UPDATE registers SET address = ?, width = ?, hash = ?, art = ? WHERE id = ?',
+            (address, register.width, digest, art, register_id)
+        )
+        connection.execute('DELETE FROM sections WHERE register_id = ?', (register_id,))
+    if not register.implicit:
+        connection.executemany(
+            'INSERT INTO sections (register_id, name, position, size) VALUES (?, ?, ?, ?)',
+            [(register_id, s.name, s.position, s.size) for s in register.sections]
+        )
+
+
+def _address_of(register):
+    return int(register.address, 16) if register.address else None
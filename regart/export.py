@@ -0,0 +1,78 @@
+import json
+import mmap
+from collections import namedtuple
+
+from regart import LRUCache, _compile_interned, _environment_cache, _generate_item, _iter_many, _normalize_address
+
+Entry = namedtuple('Entry', ['name', 'address', 'offset', 'length'])
+
+Export = namedtuple('Export', ['buffer', 'entries', 'errors'])
+
+ExportResult = namedtuple('ExportResult', ['exported', 'size', 'errors'])
+
+
+def render_batch(regs, forgiveness=False, workers=1):
+    buffer = bytearray()
+    entries = []
+    errors = []
+    if workers == 1:
+        layouts = LRUCache()
+        results = (_render_item(reg, forgiveness, layouts) for reg in regs)
+    else:
+        results = _zip_many(regs, forgiveness, workers)
+    for reg, result in results:
+        name = reg.get('name', 'REG')
+        if isinstance(result, Exception):
+            errors.append(ValueError('{}: {}'.format(name, result.args[0] if result.args else result)))
+            continue
+        offset = len(buffer)
+        if isinstance(result, str):
+            buffer += result.encode('utf-8')
+            address = _address_of(reg)
+        else:
+            for line in result.iter_lines():
+                buffer += line.encode('utf-8')
+            address = result.address
+        entries.append(Entry(name, address, offset, len(buffer) - offset))
+        buffer += b'\n'
+    return Export(buffer, entries, errors)
+
+
+def export(regs, path, index_path=None, forgiveness=False, workers=1):
+    batch = render_batch(regs, forgiveness, workers)
+    with open(path, 'wb') as f:
+        f.write(batch.buffer)
+    if index_path is not None:
+        with open(index_path, 'w') as f:
+            f.write(''.join(json.dumps(entry._asdict()) + '\n' for entry in batch.entries))
+    return ExportResult(len(batch.entries), len(batch.buffer), batch.errors)
+
+
+def read_index(index_path):
+    with open(index_path) as f:
+        return [Entry(**json.loads(line)) for line in f if line.strip()]
+
+
+def read_art(path, entry):
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return m[entry.offset:entry.offset + entry.length].decode('utf-8')
+
+
+def _render_item(reg, forgiveness, layouts):
+    if _environment_cache():
+        return reg, _generate_item(reg, forgiveness, layouts=layouts)
+    try:
+        return reg, _compile_interned(reg, forgiveness, layouts)
+    except Exception as e:
+        return reg, e
+
+
+def _zip_many(regs, forgiveness, workers):
+    import itertools
+    regs, items = itertools.tee(regs)
+    return zip(items, _iter_many(regs, forgiveness, workers=workers, chunksize=64))
+
+
+def _address_of(reg):
+    return _normalize_address(reg['address']) if 'address' in reg else ''
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+from collections import namedtuple
+
+import regart
+
+MARKER = b'/* regart:'
+
+SOURCE_EXTENSIONS = ('.h', '.hh', '.hpp', '.hxx', '.c', '.cc', '.cpp', '.cxx', '.inc')
+
+HeaderUpdate = namedtuple('HeaderUpdate', ['rendered', 'unchanged'])
+TreeUpdate = namedtuple('TreeUpdate', ['scanned', 'updated', 'rendered', 'unchanged', 'errors'])
+
+_marker_pattern = re.compile(r'^([ \t]*)/\* regart:([0-9a-f]*) (.*) \*/[ \t]*$')
+_block_start_pattern = re.compile(r'^[ \t]*/\*-+#[ \t]*$')
+_block_end_pattern = re.compile(r'^[ \t]*#-+\*/[ \t]*$')
+
+
+def spec_hash(spec):
+    spec = dict(spec)
+    forgiveness = spec.pop('forgiveness', False)
+    key = (regart.__version__, regart.RENDER_FORMAT, regart._fingerprint(regart._normalize(spec), forgiveness))
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:12]
+
+
+def marker(spec):
+    return '/* regart:{} {} */'.format(spec_hash(spec), json.dumps(spec, sort_keys=True))
+
+
+def update_text(text):
+    lines = text.splitlines(True)
+    output = []
+    rendered = 0
+    unchanged = 0
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        m = _marker_pattern.match(line.rstrip('\r\n'))
+        if not m:
+            output.append(line)
+            continue
+        indent, old_hash, spec_text = m.groups()
+        newline = line[len(line.rstrip('\r\n')):] or '\n'
+        try:
+            spec = json.loads(spec_text)
+            new_hash = spec_hash(spec)
+        except ValueError as e:
+            raise ValueError('Line {}: {}'.format(i, e.args[0]))
+        block_end = _find_block(lines, i)
+        if block_end is not None and old_hash == new_hash:
+            output.extend(lines[i - 1:block_end])
+            i = block_end
+            unchanged += 1
+            continue
+        spec = dict(spec)
+        forgiveness = spec.pop('forgiveness', False)
+        try:
+            art = regart.generate(spec, forgiveness)
+        except ValueError as e:
+            raise ValueError('Line {}: {}'.format(i, e.args[0]))
+        output.append('{}/* regart:{} {} */{}'.format(indent, new_hash, spec_text, newline))
+        for art_line in art.splitlines():
+            output.append(indent + art_line + newline)
+        if block_end is not None:
+            i = block_end
+        rendered += 1
+    return ''.join(output), HeaderUpdate(rendered, unchanged)
+
+
+def update_file(path):
+    with open(path, 'rb') as f:
+        if not _contains_marker(f):
+            return HeaderUpdate(0, 0)
+        data = f.read()
+    text = data.decode('utf-8', 'surrogateescape')
+    try:
+        new_text, result = update_text(text)
+    except ValueError as e:
+        raise ValueError('{}: {}'.format(path, e.args[0]))
+    if result.rendered:
+        _write_atomically(path, new_text.encode('utf-8', 'surrogateescape'))
+    return result
+
+
+def update_tree(root, workers=None, extensions=SOURCE_EXTENSIONS):
+    paths = _iter_source_files(root, extensions)
+    if workers == 1:
+        results = (_update_tree_file(path) for path in paths)
+        return _summarize(results)
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _summarize(executor.map(_update_tree_file, paths, chunksize=256))
+
+
+def _iter_source_files(root, extensions):
+    for directory, directories, files in os.walk(root):
+        directories[:] = sorted(d for d in directories if not d.startswith('.'))
+        for name in sorted(files):
+            if name.endswith(extensions):
+                yield os.path.join(directory, name)
+
+
+def _update_tree_file(path):
+    try:
+        return path, update_file(path)
+    except Exception as e:
+        return path, e
+
+
+def _summarize(results):
+    scanned = updated = rendered = unchanged = 0
+    errors = []
+    for path, result in results:
+        scanned += 1
+        if isinstance(result, Exception):
+            errors.append(result if isinstance(result, ValueError) else ValueError('{}: {}'.format(path, result)))
+            continue
+        if result.rendered:
+            updated += 1
+        rendered += result.rendered
+        unchanged += result.unchanged
+    return TreeUpdate(scanned, updated, rendered, unchanged, errors)
+
+
+def _contains_marker(f):
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        return False
+    try:
+        return mapped.find(MARKER) != -1
+    finally:
+        mapped.close()
+
+
+def _find_block(lines, start):
+    if start >= len(lines) or not _block_start_pattern.match(lines[start].rstrip('\r\n')):
+        return None
+    for i in range(start + 1, len(lines)):
+        if _block_end_pattern.match(lines[i].rstrip('\r\n')):
+            return i + 1
+    raise ValueError('Line {}: Unterminated register art block.'.format(start + 1))
+
+
+def _write_atomically(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp = tempfile.mkstemp(dir=directory, prefix='.regart')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        mode = os.stat(path).st_mode
+        os.chmod(temp, mode & 0o7777)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
@@ -0,0 +1,64 @@
+import json
+from bisect import bisect_left, bisect_right
+
+from regart import normalize_to_int
+
+
+def iter_map(path):
+    with open(path) as f:
+        first = _first_character(f)
+        if first == '[':
+            for reg in json.load(f):
+                yield reg
+        else:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    raise ValueError('Invalid register definition in line {} of {}.'.format(number, path))
+
+
+def _first_character(f):
+    while True:
+        position = f.tell()
+        line = f.readline()
+        if not line:
+            return ''
+        if line.strip():
+            f.seek(position)
+            return line.strip()[0]
+
+
+class RegisterMap(object):
+    def __init__(self, regs):
+        entries = []
+        for reg in regs:
+            if 'address' not in reg:
+                continue
+            try:
+                address = normalize_to_int(reg['address'], 'address')
+                width = normalize_to_int(reg.get('width', 8), 'width')
+            except ValueError as e:
+                raise ValueError('{}: {}'.format(reg.get('name', 'REG'), e.args[0]))
+            entries.append((address, address + max((width + 7) // 8, 1) - 1, reg))
+        entries.sort(key=lambda entry: entry[0])
+        self._addresses = [entry[0] for entry in entries]
+        self._entries = entries
+        self._max_span = max([end - start + 1 for start, end, _ in entries] or [1])
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(iter_map(path))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def in_range(self, lo, hi):
+        lo = normalize_to_int(lo, 'lo')
+        hi = normalize_to_int(hi, 'hi')
+        first = bisect_left(self._addresses, lo - self._max_span + 1)
+        last = bisect_right(self._addresses, hi)
+        return [reg for start, end, reg in self._entries[first:last] if end >= lo]
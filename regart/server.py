@@ -0,0 +1,95 @@
+import json
+import os
+import socket
+
+from regart import generate
+
+
+def serve(path):
+    import asyncio
+    if os.path.exists(path):
+        if _is_listening(path):
+            raise ValueError('A regart server is already listening on {}.'.format(path))
+        os.unlink(path)
+    try:
+        asyncio.run(_serve(path))
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+async def _serve(path):
+    import asyncio
+    import signal
+    loop = asyncio.get_running_loop()
+    stopped = loop.create_future()
+    for signum in [signal.SIGINT, signal.SIGTERM]:
+        loop.add_signal_handler(signum, _stop, stopped)
+    server = await asyncio.start_unix_server(_handle, path=path)
+    async with server:
+        await stopped
+
+
+def _stop(stopped):
+    if not stopped.done():
+        stopped.set_result(None)
+
+
+async def _handle(reader, writer):
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            writer.write(respond(line))
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+def respond(line):
+    try:
+        request = json.loads(line)
+        result = generate(request.get('reg', {}), request.get('forgiveness', False), cache=True)
+        response = {'ok': True, 'result': result}
+    except Exception as e:
+        response = {'ok': False, 'error': str(e.args[0]) if e.args else type(e).__name__}
+    return (json.dumps(response) + '\n').encode('utf-8')
+
+
+def request(path, reg, forgiveness=False, timeout=5.0):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(timeout)
+        client.connect(path)
+        message = json.dumps({'reg': reg, 'forgiveness': forgiveness}) + '\n'
+        client.sendall(message.encode('utf-8'))
+        response = _read_line(client)
+    finally:
+        client.close()
+    response = json.loads(response.decode('utf-8'))
+    if not response['ok']:
+        raise ValueError(response['error'])
+    return response['result']
+
+
+def _read_line(client):
+    chunks = []
+    while True:
+        chunk = client.recv(65536)
+        if not chunk:
+            raise IOError('Connection closed by the regart server.')
+        chunks.append(chunk)
+        if chunk.endswith(b'\n'):
+            return b''.join(chunks)
+
+
+def _is_listening(path):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+        return True
+    except (IOError, OSError):
+        return False
+    finally:
+        client.close()
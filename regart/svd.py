@@ -0,0 +1,218 @@
+import fnmatch
+import re
+import xml.etree.ElementTree as ElementTree
+
+_derived_pattern = re.compile(br'<(?:[\w.-]+:)?peripheral\b[^>]*?\bderivedFrom\s*=\s*["\']([^"\']+)["\']')
+
+
+def iter_registers(source, peripheral=None):
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            for reg in iter_registers(f, peripheral):
+                yield reg
+        return
+    referenced = _referenced_peripherals(source)
+    derivable = {}
+    contexts = []
+    container = None
+    for event, elem in ElementTree.iterparse(source, events=('start', 'end')):
+        tag = elem.tag
+        if '}' in tag:
+            tag = tag.rsplit('}', 1)[1]
+        if event == 'start':
+            if tag in ('device', 'peripheral', 'cluster'):
+                contexts.append(_new_context(tag, elem, contexts))
+            elif tag == 'peripherals':
+                container = elem
+            continue
+
+        if tag == 'register':
+            context = _peripheral_context(contexts)
+            registers = _parse_register(elem, contexts)
+            context['defined'] = True
+            if referenced is None or context['name'] in referenced:
+                context['registers'].extend(registers)
+            if _selected(context, peripheral):
+                for reg in registers:
+                    yield _to_dict(context, reg)
+            elem.clear()
+        elif tag == 'peripheral':
+            context = _load_context(contexts.pop())
+            base = derivable.get(context['derived'])
+            if base is not None and not context['defined']:
+                context['registers'] = base['registers']
+                if _selected(context, peripheral):
+                    for reg in context['registers']:
+                        yield _to_dict(context, reg)
+            context['elem'] = None
+            if referenced is None or context['name'] in referenced:
+                derivable[context['name']] = context
+            elem.clear()
+            if container is not None:
+                container.remove(elem)
+        elif tag in ('cluster', 'device'):
+            contexts.pop()
+
+
+def _referenced_peripherals(f):
+    try:
+        if not f.seekable():
+            return None
+        start = f.tell()
+    except AttributeError:
+        return None
+    referenced = set()
+    tail = b''
+    while True:
+        chunk = f.read(1 << 20)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = tail + chunk
+        referenced.update(name.decode('utf-8') for name in _derived_pattern.findall(data))
+        tail = data[-4096:]
+    f.seek(start)
+    return referenced
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _new_context(kind, elem, contexts):
+    return {
+        'kind': kind,
+        'elem': elem,
+        'outer': contexts[-1] if contexts else None,
+        'loaded': False,
+        'derived': elem.get('derivedFrom'),
+        'defined': False,
+        'registers': []
+    }
+
+
+def _load_context(context):
+    if context['loaded']:
+        return context
+    outer = context['outer']
+    if outer is not None:
+        _load_context(outer)
+    texts = _child_texts(context['elem'])
+    context['name'] = texts.get('name', '')
+    context['offset'] = _to_int(texts.get('baseAddress', texts.get('addressOffset', '0')))
+    if 'size' in texts:
+        context['size'] = _to_int(texts['size'])
+    else:
+        context['size'] = outer['size'] if outer is not None else 32
+    context['prefix'] = ''
+    if context['kind'] == 'cluster':
+        name = context['name'].replace('[%s]', '').replace('%s', '')
+        context['prefix'] = outer['prefix'] + name + '_'
+        if outer['kind'] == 'cluster':
+            context['offset'] += outer['offset']
+    context['loaded'] = True
+    return context
+
+
+def _peripheral_context(contexts):
+    for context in reversed(contexts):
+        if context['kind'] == 'peripheral':
+            return _load_context(context)
+    return _load_context(contexts[-1])
+
+
+def _selected(context, pattern):
+    return pattern is None or fnmatch.fnmatchcase(context['name'], pattern)
+
+
+def _parse_register(elem, contexts):
+    context = _load_context(contexts[-1])
+    texts = _child_texts(elem)
+    offset = _to_int(texts.get('addressOffset', '0'))
+    if context['kind'] == 'cluster':
+        offset += context['offset']
+    width = _to_int(texts['size']) if 'size' in texts else context['size']
+    sections = []
+    for fields in elem:
+        if _local_name(fields.tag) != 'fields':
+            continue
+        for field in fields:
+            if _local_name(field.tag) != 'field':
+                continue
+            field_texts = _child_texts(field)
+            position, size = _field_geometry(field_texts)
+            for name, field_offset in _expand_dim(field_texts, field_texts.get('name')):
+                sections.append((name, position + field_offset, size))
+    sections = tuple(sections)
+    return [
+        (context['prefix'] + name, offset + reg_offset, width, sections)
+        for name, reg_offset in _expand_dim(texts, texts.get('name'))
+    ]
+
+
+def _child_texts(elem):
+    texts = {}
+    for child in elem:
+        if child.text is not None:
+            texts[_local_name(child.tag)] = child.text.strip()
+    return texts
+
+
+def _field_geometry(texts):
+    if 'bitOffset' in texts:
+        return _to_int(texts['bitOffset']), _to_int(texts.get('bitWidth', '1'))
+    if 'lsb' in texts:
+        return _to_int(texts['lsb']), _to_int(texts['msb']) - _to_int(texts['lsb']) + 1
+    if 'bitRange' in texts:
+        msb, lsb = texts['bitRange'].strip('[]').split(':')
+        return _to_int(lsb), _to_int(msb) - _to_int(lsb) + 1
+    raise ValueError('Field "{}" has no bit position.'.format(texts.get('name')))
+
+
+def _expand_dim(texts, name):
+    if 'dim' not in texts:
+        return [(name, 0)]
+    dim = _to_int(texts['dim'])
+    increment = _to_int(texts.get('dimIncrement', '0'))
+    indices = _dim_indices(texts.get('dimIndex'), dim)
+    name = name.replace('[%s]', '%s')
+    return [(name.replace('%s', index), i * increment) for i, index in enumerate(indices)]
+
+
+def _dim_indices(dim_index, dim):
+    if dim_index is None:
+        return [str(i) for i in range(dim)]
+    if '-' in dim_index and ',' not in dim_index:
+        first, last = dim_index.split('-')
+        if first.isdigit():
+            return [str(i) for i in range(int(first), int(last) + 1)]
+        return [chr(c) for c in range(ord(first), ord(last) + 1)]
+    return [index.strip() for index in dim_index.split(',')]
+
+
+def _to_int(text):
+    text = text.strip()
+    try:
+        if text[:2] in ('0x', '0X'):
+            return int(text, 16)
+        if text.startswith('#'):
+            return int(text[1:], 2)
+        return int(text)
+    except ValueError:
+        raise ValueError('Invalid SVD number "{}".'.format(text))
+
+
+def _to_dict(context, reg):
+    name, offset, width, sections = reg
+    result = {
+        'name': '{}_{}'.format(context['name'], name) if context['name'] else name,
+        'address': hex(context['offset'] + offset),
+        'width': width
+    }
+    if sections:
+        result['sections'] = dict(
+            (section, {'position': position, 'size': size})
+            for section, position, size in sections
+        )
+    return result
@@ -0,0 +1,118 @@
+import json
+import os
+from collections import deque, namedtuple
+
+from regart import compile, _chunked, _field_format
+
+Decoder = namedtuple('Decoder', ['name', 'address', 'fields', 'template', 'json_template'])
+
+_index = None
+_as_json = False
+
+
+def build_index(regs, forgiveness=False, value_format='hex', errors=None):
+    if value_format not in ['hex', 'bin']:
+        raise ValueError('Value format has to be one of: hex, bin.')
+    index = {}
+    for reg in regs:
+        try:
+            layout = compile(reg, forgiveness)
+        except ValueError as e:
+            error = ValueError('{}: {}'.format(reg.get('name', 'REG'), e.args[0]))
+            if errors is None:
+                raise error
+            errors.append(error)
+            continue
+        if not layout.address:
+            continue
+        sections = [
+            (section, shift_mask)
+            for section, shift_mask in zip(layout.sections, layout.fields)
+            if section.name != '-'
+        ]
+        template = ' '.join(
+            '{}={}'.format(_escape(section.name), _field_format(section.size, value_format))
+            for section, _ in sections
+        )
+        json_template = (
+            '{{"name": ' + _escape(json.dumps(layout.name)) +
+            ', "address": "' + layout.address + '", "value": "{}", "fields": {{' +
+            ', '.join(_escape(json.dumps(section.name)) + ': {}' for section, _ in sections) +
+            '}}}}'
+        )
+        fields = tuple(shift_mask for _, shift_mask in sections)
+        index[int(layout.address, 16)] = Decoder(layout.name, layout.address, fields, template, json_template)
+    return index
+
+
+def _escape(text):
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+def decode_line(line, index, as_json=False):
+    text = line.strip()
+    address, separator, value = text.partition('=')
+    decoder = None
+    if separator:
+        try:
+            decoder = index.get(int(address, 16))
+            value = int(value, 16)
+        except ValueError:
+            decoder = None
+    if decoder is None:
+        return None if as_json else text
+    values = [(value >> shift) & mask for shift, mask in decoder.fields]
+    if as_json:
+        return decoder.json_template.format('0x{:X}'.format(value), *values)
+    return '{} {} {}'.format(decoder.name, text, decoder.template.format(*values))
+
+
+def iter_decode(lines, index, as_json=False, workers=1, chunksize=4096):
+    if workers == 1:
+        for line in lines:
+            result = decode_line(line, index, as_json)
+            if result is not None:
+                yield result
+        return
+    for block in _iter_blocks(lines, index, as_json, workers, chunksize):
+        for result in block.splitlines():
+            yield result
+
+
+def decode_stream(lines, stream, index, as_json=False, workers=1, chunksize=4096):
+    if workers == 1:
+        for line in lines:
+            result = decode_line(line, index, as_json)
+            if result is not None:
+                stream.write(result + '\n')
+        return
+    for block in _iter_blocks(lines, index, as_json, workers, chunksize):
+        stream.write(block)
+
+
+def _iter_blocks(lines, index, as_json, workers, chunksize):
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(index, as_json)) as executor:
+        for chunk in _chunked(lines, chunksize):
+            pending.append(executor.submit(_decode_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _init_worker(index, as_json):
+    global _index, _as_json
+    _index = index
+    _as_json = as_json
+
+
+def _decode_chunk(lines):
+    results = []
+    for line in lines:
+        result = decode_line(line, _index, _as_json)
+        if result is not None:
+            results.append(result + '\n')
+    return ''.join(results)
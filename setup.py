@@ -1,8 +1,12 @@
+import re
 from setuptools import find_packages, setup
 
+with open('regart/__init__.py') as f:
+    version = re.search(r"^__version__ = '([^']+)'", f.read(), re.M).group(1)
+
 setup(
     name='regart',
-    version='1.0.5',
+    version=version,
     description='Register art generator for ASCII based visual register section descriptions.',
     long_description=("."),
     author='Tibor Simon',
@@ -12,11 +16,19 @@ setup(
     test_suite='test',
     keywords='register, ascii, art, printout, tool, helper, bit, section',
     packages=find_packages(),
-    scripts=['bin/regart'],
+    entry_points={
+        'console_scripts': [
+            'regart = regart.__main__:main',
+        ],
+    },
     install_requires=[
           'mock>=2.0.0',
           'termcolor',
     ],
+    extras_require={
+          'numpy': ['numpy'],
+    },
+    python_requires='>=3.7',
     include_package_data=True,
     zip_safe=False,
     classifiers=[
@@ -29,5 +41,12 @@ setup(
           'Operating System :: Unix',
           'License :: OSI Approved :: MIT License',
           'Programming Language :: Python',
+          'Programming Language :: Python :: 3',
+          'Programming Language :: Python :: 3 :: Only',
+          'Programming Language :: Python :: 3.7',
+          'Programming Language :: Python :: 3.8',
+          'Programming Language :: Python :: 3.9',
+          'Programming Language :: Python :: 3.10',
+          'Programming Language :: Python :: 3.11',
     ],
 )
@@ -1,7 +1,10 @@
 from unittest import TestCase
 
 from regart import generate
+from regart import _normalize
 from regart import _transform_sections
+from regart import Register
+from regart import Section
 from regart import _default_width_for_size
 
 
@@ -56,29 +59,43 @@ class SectionTransformation(TestCase):
                 }
             }
         }
+        expected = Register(
+            name='REGA',
+            address='0x123',
+            width=8,
+            sections=(
+                Section(name='S3', position=2, size=1),
+                Section(name='S2', position=1, size=1),
+                Section(name='S1', position=0, size=1)
+            ),
+            implicit=False
+        )
+        result = _transform_sections(_normalize(reg))
+        self.assertEqual(expected, result)
+
+    def test__input_register_is_not_modified(self):
+        reg = {
+            'width': '8',
+            'address': 291,
+            'sections': {
+                'S1': {
+                    'position': '0',
+                    'size': '0x8'
+                }
+            }
+        }
         expected = {
-            'width': 8,
-            'name': 'REGA',
-            'address': '0x123',
-            'sections': [
-                {
-                    'name': 'S3',
-                    'position': 2,
-                    'size': 1
-                },
-                {
-                    'name': 'S2',
-                    'position': 1,
-                    'size': 1
-                },
-                {
-                    'name': 'S1',
-                    'position': 0,
-                    'size': 1
+            'width': '8',
+            'address': 291,
+            'sections': {
+                'S1': {
+                    'position': '0',
+                    'size': '0x8'
                 }
-            ]
+            }
         }
-        _transform_sections(reg)
+        generate(reg)
+        generate(reg, forgiveness=True)
         self.assertEqual(expected, reg)
 
 
@@ -1124,3 +1141,38 @@ class ForgivenessCases(TestCase):
         self.assertEquals(expected, result)
 
 
+class WideRegisters(TestCase):
+    def _reg(self, width, step):
+        return {
+            'width': width,
+            'name': 'WIDE',
+            'sections': dict(
+                ('S{}'.format(pos), {'position': pos, 'size': step})
+                for pos in range(0, width, step)
+            )
+        }
+
+    def test__4096_bit_register_can_be_validated(self):
+        reg = self._reg(4096, 8)
+        result = generate(reg)
+        self.assertTrue(result.startswith('/*'))
+
+    def test__overlap_in_a_wide_register_is_detected(self):
+        reg = self._reg(4096, 8)
+        reg['sections']['X'] = {'position': 2043, 'size': 2}
+        with self.assertRaises(ValueError):
+            generate(reg)
+
+    def test__section_inside_a_longer_one_is_detected(self):
+        reg = self._reg(4096, 64)
+        reg['sections']['X'] = {'position': 2050, 'size': 1}
+        with self.assertRaises(ValueError):
+            generate(reg)
+
+    def test__holes_in_a_wide_register_are_filled(self):
+        reg = self._reg(4096, 8)
+        del reg['sections']['S4088']
+        del reg['sections']['S8']
+        result = generate(reg, forgiveness=True)
+        sections_row = result.split('\n')[3]
+        self.assertEqual(16, sections_row.count('| - '))
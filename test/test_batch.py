@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+from regart import generate
+from regart import generate_many
+from regart import Stats
+
+
+class GenerateMany(TestCase):
+    def setUp(self):
+        self.regs = [
+            {
+                'name': 'REG{}'.format(i),
+                'address': i * 4,
+                'width': 4
+            } for i in range(8)
+        ]
+
+    def test__results_are_in_input_order(self):
+        expected = [generate(reg) for reg in self.regs]
+        result = generate_many(self.regs, workers=2, chunksize=3)
+        self.assertEqual(expected, result)
+
+    def test__serial_mode_gives_the_same_result(self):
+        expected = generate_many(self.regs, workers=2)
+        result = generate_many(self.regs, workers=1)
+        self.assertEqual(expected, result)
+
+    def test__errors_are_collected_per_item(self):
+        regs = [
+            {'width': 4},
+            {'width': 4, 'sections': {'AA': {'position': 0, 'size': 3}}},
+            {'width': 'lkj'},
+            {'width': 2}
+        ]
+        result = generate_many(regs, workers=2)
+        self.assertEqual(generate(regs[0]), result[0])
+        self.assertIsInstance(result[1], ValueError)
+        self.assertEqual('Sections do not fill the register width.', result[1].args[0])
+        self.assertIsInstance(result[2], ValueError)
+        self.assertEqual(generate(regs[3]), result[3])
+
+    def test__forgiveness_is_passed_to_every_item(self):
+        regs = [{'width': 4, 'sections': {'AA': {'position': 0, 'size': 3}}}]
+        result = generate_many(regs, forgiveness=True, workers=1)
+        self.assertEqual([generate(regs[0], forgiveness=True)], result)
+
+
+class LayoutInterning(TestCase):
+    def setUp(self):
+        self.regs = [
+            {
+                'name': 'DMA_CH{}_CR'.format(i),
+                'address': 0x40020000 + i * 0x14,
+                'width': 8,
+                'sections': {
+                    'EN': {'position': 0, 'size': 1},
+                    'MODE': {'position': 1, 'size': 3},
+                    'PRIORITY': {'position': 4, 'size': 4}
+                }
+            } for i in range(6)
+        ]
+
+    def test__instances_are_stamped_from_one_layout(self):
+        stats = Stats()
+        result = generate_many(self.regs, workers=1, stats=stats)
+        self.assertEqual([generate(reg, cache=False) for reg in self.regs], result)
+        self.assertEqual(1, stats.times['solve'][0])
+        self.assertEqual(5, stats.counts['layouts reused'])
+        self.assertIn('dedup ratio', stats.table())
+
+    def test__long_names_still_widen_the_title(self):
+        self.regs[3]['name'] = 'A_VERY_LONG_DMA_CHANNEL_CONTROL_REGISTER'
+        self.assertEqual([generate(reg, cache=False) for reg in self.regs], generate_many(self.regs, workers=1))
+
+    def test__name_equal_to_the_only_section_hides_the_section_row(self):
+        regs = [
+            {'name': 'A', 'width': 4, 'sections': {'A': {'position': 0, 'size': 4}}},
+            {'name': 'B', 'width': 4, 'sections': {'A': {'position': 0, 'size': 4}}}
+        ]
+        self.assertEqual([generate(reg, cache=False) for reg in regs], generate_many(regs, workers=1))
+
+    def test__different_shapes_are_not_shared(self):
+        regs = [{'name': 'A', 'width': 8}, {'name': 'B', 'width': 4}, dict(self.regs[0], width=9)]
+        result = generate_many(regs, forgiveness=True, workers=1)
+        self.assertEqual([generate(reg, forgiveness=True, cache=False) for reg in regs], result)
@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+import regart
+from regart import generate
+from regart import LRUCache
+
+
+def _reg(name='REGA', position=0):
+    return {
+        'width': 4,
+        'name': name,
+        'address': '0x123',
+        'sections': {
+            'AA': {
+                'position': position,
+                'size': 4 - position
+            }
+        }
+    }
+
+
+class InProcessCache(TestCase):
+    def setUp(self):
+        regart.cache_clear()
+
+    def tearDown(self):
+        regart.cache_clear()
+        regart.cache_resize(1024)
+
+    def test__cached_result_equals_uncached_result(self):
+        expected = generate(_reg())
+        self.assertEqual(expected, generate(_reg(), cache=True))
+        self.assertEqual(expected, generate(_reg(), cache=True))
+        info = regart.cache_info()
+        self.assertEqual(1, info.hits)
+        self.assertEqual(1, info.misses)
+        self.assertEqual(1, info.currsize)
+
+    def test__equivalent_definitions_share_an_entry(self):
+        generate(_reg(), cache=True)
+        reg = _reg()
+        reg['address'] = 0x123
+        reg['sections']['AA'] = {'position': '0', 'size': '0x4'}
+        generate(reg, cache=True)
+        self.assertEqual(1, regart.cache_info().hits)
+
+    def test__forgiveness_is_part_of_the_key(self):
+        generate(_reg(), cache=True)
+        generate(_reg(), forgiveness=True, cache=True)
+        self.assertEqual(0, regart.cache_info().hits)
+        self.assertEqual(2, regart.cache_info().currsize)
+
+    def test__errors_are_not_cached(self):
+        reg = _reg(position=1)
+        with self.assertRaises(ValueError):
+            generate(reg, cache=True)
+        self.assertEqual(0, regart.cache_info().currsize)
+
+    def test__least_recently_used_entry_gets_evicted(self):
+        regart.cache_resize(2)
+        generate(_reg('A'), cache=True)
+        generate(_reg('B'), cache=True)
+        generate(_reg('A'), cache=True)
+        generate(_reg('C'), cache=True)
+        generate(_reg('A'), cache=True)
+        generate(_reg('B'), cache=True)
+        info = regart.cache_info()
+        self.assertEqual(2, info.hits)
+        self.assertEqual(4, info.misses)
+        self.assertEqual(2, info.currsize)
+
+    def test__cache_clear_resets_the_counters(self):
+        generate(_reg(), cache=True)
+        regart.cache_clear()
+        self.assertEqual((0, 0, 1024, 0), tuple(regart.cache_info()))
+
+    def test__private_cache_instance_can_be_passed(self):
+        cache = LRUCache(maxsize=8)
+        generate(_reg(), cache=cache)
+        generate(_reg(), cache=cache)
+        self.assertEqual(1, cache.info().hits)
+        self.assertEqual(0, regart.cache_info().currsize)
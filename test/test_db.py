@@ -0,0 +1,84 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import regart
+from regart.db import find, import_registers
+
+
+class RegisterDatabase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'soc.db')
+        self.regs = [
+            {'name': 'UART0_CR', 'address': '0x40001000', 'sections': {'EN': {'position': 0, 'size': 8}}},
+            {'name': 'UART1_CR', 'address': '0x40002000', 'width': 16},
+            {'name': 'SPI0_CR', 'address': '0x40003000', 'width': 4}
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test__imported_registers_are_rendered(self):
+        result = import_registers(self.path, self.regs)
+        self.assertEqual((3, 3, 0), result[:3])
+        self.assertEqual([regart.generate(self.regs[1])], [r.art for r in find(self.path, address=0x40002000)])
+
+    def test__only_changed_registers_are_rendered_again(self):
+        import_registers(self.path, self.regs)
+        self.regs[2]['width'] = 8
+        result = import_registers(self.path, self.regs)
+        self.assertEqual((3, 1, 2), result[:3])
+        self.assertEqual(regart.generate(self.regs[2]), find(self.path, name='SPI0_CR')[0].art)
+
+    def test__render_format_change_renders_registers_again(self):
+        import_registers(self.path, self.regs)
+        with patch.object(regart, 'RENDER_FORMAT', regart.RENDER_FORMAT + 1):
+            self.assertEqual(3, import_registers(self.path, self.regs).rendered)
+
+    def test__forgiveness_is_part_of_the_hash(self):
+        import_registers(self.path, self.regs)
+        self.assertEqual(3, import_registers(self.path, self.regs, forgiveness=True).rendered)
+
+    def test__name_pattern_lookup(self):
+        import_registers(self.path, self.regs)
+        self.assertEqual(['UART0_CR', 'UART1_CR'], [r.name for r in find(self.path, name='UART*')])
+        self.assertEqual([], find(self.path, name='uart*'))
+
+    def test__address_lookup(self):
+        import_registers(self.path, self.regs)
+        self.assertEqual(['SPI0_CR'], [r.name for r in find(self.path, address='0x40003000')])
+
+    def test__sections_are_stored(self):
+        import_registers(self.path, self.regs)
+        connection = sqlite3.connect(self.path)
+        rows = connection.execute('SELECT name, position, size FROM sections').fetchall()
+        connection.close()
+        self.assertEqual([('EN', 0, 8)], rows)
+
+    def test__registers_with_the_same_name_are_kept_apart(self):
+        self.regs = [
+            {'name': 'CR', 'address': '0x1000', 'width': 8},
+            {'name': 'CR', 'address': '0x2000', 'width': 16}
+        ]
+        self.assertEqual((2, 2, 0), import_registers(self.path, self.regs)[:3])
+        self.assertEqual((2, 0, 2), import_registers(self.path, self.regs)[:3])
+        self.assertEqual([regart.generate(self.regs[0])], [r.art for r in find(self.path, address=0x1000)])
+        self.assertEqual([8, 16], [r.width for r in find(self.path, name='CR')])
+
+    def test__duplicate_registers_are_reported(self):
+        self.regs.append({'name': 'SPI0_CR', 'address': '0x40003000', 'width': 8})
+        result = import_registers(self.path, self.regs)
+        self.assertEqual(3, result.imported)
+        self.assertEqual(['SPI0_CR: Register is defined more than once.'], [str(e) for e in result.errors])
+        self.assertEqual([4], [r.width for r in find(self.path, name='SPI0_CR')])
+
+    def test__invalid_registers_are_reported(self):
+        self.regs.append({'name': 'BAD', 'sections': {'X': {'position': 0, 'size': 4}}})
+        result = import_registers(self.path, self.regs)
+        self.assertEqual(3, result.imported)
+        self.assertEqual(['BAD: Sections do not fill the register width.'], [str(e) for e in result.errors])
+        self.assertEqual([], find(self.path, name='BAD'))
@@ -0,0 +1,67 @@
+from unittest import TestCase, skipUnless
+
+import regart
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@skipUnless(numpy, 'numpy is not installed')
+class ArrayDecoding(TestCase):
+    def setUp(self):
+        self.reg = {
+            'name': 'CTRL',
+            'width': 16,
+            'sections': {
+                'DATA': {'position': 8, 'size': 8},
+                'MODE': {'position': 1, 'size': 3},
+                'EN': {'position': 0, 'size': 1}
+            }
+        }
+
+    def test__fields_are_extracted_in_section_order(self):
+        values = numpy.array([0xA50B, 0x0001, 0xFFFF], dtype=numpy.uint16)
+        result = regart.decode_array(self.reg, values, forgiveness=True)
+        self.assertEqual(['DATA', 'MODE', 'EN'], list(result))
+        self.assertEqual([0xA5, 0x00, 0xFF], result['DATA'].tolist())
+        self.assertEqual([5, 0, 7], result['MODE'].tolist())
+        self.assertEqual([1, 1, 1], result['EN'].tolist())
+
+    def test__fields_use_the_smallest_unsigned_type(self):
+        values = numpy.array([0xA50B], dtype=numpy.int64)
+        result = regart.decode_array(self.reg, values, forgiveness=True)
+        self.assertEqual(numpy.uint8, result['DATA'].dtype)
+
+    def test__array_matches_scalar_decode(self):
+        values = numpy.arange(0, 1 << 16, 97, dtype=numpy.uint32)
+        layout = regart.compile(self.reg, forgiveness=True)
+        result = layout.decode_array(values)
+        for i in [0, 1, 100, len(values) - 1]:
+            expected = [v for s, v in zip(layout.sections, layout.decode(int(values[i]))) if s.name != '-']
+            self.assertEqual(expected, [int(result[name][i]) for name in result])
+
+    def test__wide_register_needs_object_array(self):
+        reg = {'width': 128, 'sections': {'HIGH': {'position': 64, 'size': 64}, 'LOW': {'position': 0, 'size': 64}}}
+        with self.assertRaises(ValueError):
+            regart.decode_array(reg, numpy.zeros(4, dtype=numpy.uint64))
+        values = numpy.array([(3 << 64) | 5], dtype=object)
+        result = regart.decode_array(reg, values)
+        self.assertEqual([3], result['HIGH'].tolist())
+        self.assertEqual([5], result['LOW'].tolist())
+
+    def test__too_wide_value_is_rejected(self):
+        with self.assertRaises(ValueError) as cm:
+            regart.decode_array(self.reg, numpy.array([1 << 16], dtype=numpy.uint32), forgiveness=True)
+        self.assertEqual('Value does not fit into the register width.', cm.exception.args[0])
+
+    def test__object_array_values_outside_the_register_width_are_rejected(self):
+        for value in [1 << 16, -3]:
+            with self.assertRaises(ValueError) as cm:
+                regart.decode_array(self.reg, numpy.array([0x1A5, value], dtype=object), forgiveness=True)
+            self.assertEqual('Value does not fit into the register width.', cm.exception.args[0])
+
+    def test__float_array_is_rejected(self):
+        with self.assertRaises(ValueError):
+            regart.decode_array(self.reg, numpy.zeros(4), forgiveness=True)
@@ -0,0 +1,110 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+
+import regart
+from regart import generate
+from regart import DiskCache
+from regart.__main__ import main
+
+
+def _reg(name='REGA'):
+    return {
+        'width': 8,
+        'name': name,
+        'address': '0x123',
+        'sections': {
+            'AA': {
+                'position': 0,
+                'size': 8
+            }
+        }
+    }
+
+
+class PersistentCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        os.environ.pop('REGART_CACHE_DIR', None)
+        regart._disk_caches.clear()
+
+    def test__cached_output_is_shared_between_cache_instances(self):
+        expected = generate(_reg())
+        self.assertEqual(expected, generate(_reg(), cache=DiskCache(self.directory)))
+        cache = DiskCache(self.directory)
+        self.assertEqual(expected, generate(_reg(), cache=cache))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(0, cache.misses)
+
+    def test__entries_are_stored_in_sharded_directories(self):
+        generate(_reg(), cache=DiskCache(self.directory))
+        shards = os.listdir(self.directory)
+        self.assertEqual(1, len(shards))
+        self.assertEqual(2, len(shards[0]))
+
+    def test__version_is_part_of_the_key(self):
+        generate(_reg(), cache=DiskCache(self.directory))
+        cache = DiskCache(self.directory)
+        cache.version = '0.0.0'
+        generate(_reg(), cache=cache)
+        self.assertEqual(1, cache.misses)
+
+    def test__render_format_is_part_of_the_key(self):
+        generate(_reg(), cache=DiskCache(self.directory))
+        with patch.object(regart, 'RENDER_FORMAT', regart.RENDER_FORMAT + 1):
+            cache = DiskCache(self.directory)
+        generate(_reg(), cache=cache)
+        self.assertEqual(1, cache.misses)
+
+    def test__oldest_entries_are_evicted_over_the_size_limit(self):
+        cache = DiskCache(self.directory, max_size=2000)
+        for i in range(20):
+            generate(_reg('REG{}'.format(i)), cache=cache)
+        size = sum(size for _, size, _ in cache._entries())
+        self.assertTrue(0 < size <= 2000)
+
+    def test__environment_variable_turns_on_the_cache(self):
+        os.environ['REGART_CACHE_DIR'] = self.directory
+        generate(_reg())
+        generate(_reg())
+        self.assertEqual(1, regart._disk_caches[self.directory].hits)
+        generate(_reg(), cache=False)
+        self.assertEqual(1, regart._disk_caches[self.directory].hits)
+
+    def test__batch_rendering_uses_the_environment_cache(self):
+        os.environ['REGART_CACHE_DIR'] = self.directory
+        regs = [_reg('REG{}'.format(i)) for i in range(3)]
+        first = regart.generate_many(regs, workers=1)
+        second = regart.generate_many(regs, workers=1)
+        cache = regart._disk_caches[self.directory]
+        self.assertEqual(3, cache.misses)
+        self.assertEqual(3, cache.hits)
+        self.assertEqual([generate(reg, cache=False) for reg in regs], first)
+        self.assertEqual(first, second)
+
+    def test__command_line_map_rendering_uses_the_cache(self):
+        path = os.path.join(self.directory, 'map.json')
+        with open(path, 'w') as f:
+            f.write(json.dumps([_reg('REG{}'.format(i)) for i in range(3)]))
+        os.environ['REGART_CACHE_DIR'] = os.path.join(self.directory, 'cache')
+        for _ in range(2):
+            with self.assertRaises(SystemExit):
+                with redirect_stdout(io.StringIO()) as output:
+                    main(['--map', path])
+        cache = regart._disk_caches[os.environ['REGART_CACHE_DIR']]
+        self.assertEqual(3, cache.misses)
+        self.assertEqual(3, cache.hits)
+        self.assertEqual(''.join(generate(_reg('REG{}'.format(i))) + '\n' for i in range(3)), output.getvalue())
+        os.environ.pop('REGART_CACHE_DIR')
+        with self.assertRaises(SystemExit):
+            with redirect_stdout(io.StringIO()) as uncached:
+                main(['--map', path])
+        self.assertEqual(uncached.getvalue(), output.getvalue())
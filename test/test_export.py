@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import regart
+from regart.export import Entry, export, read_art, read_index, render_batch
+
+
+class BatchExport(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.regs = [
+            {'name': 'CTRL', 'address': '0x4000', 'sections': {'EN': {'position': 0, 'size': 8}}},
+            {'name': 'BAD', 'width': 8, 'sections': {'X': {'position': 0, 'size': 4}}},
+            {'name': 'STATUS', 'address': 16, 'width': 16}
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        os.environ.pop('REGART_CACHE_DIR', None)
+        regart._disk_caches.clear()
+
+    def test__registers_are_rendered_into_one_buffer(self):
+        batch = render_batch(self.regs)
+        expected = regart.generate(self.regs[0]) + '\n' + regart.generate(self.regs[2]) + '\n'
+        self.assertEqual(expected.encode('utf-8'), bytes(batch.buffer))
+
+    def test__index_points_to_the_art_of_each_register(self):
+        batch = render_batch(self.regs)
+        self.assertEqual(['CTRL', 'STATUS'], [entry.name for entry in batch.entries])
+        self.assertEqual(['0x4000', '0x10'], [entry.address for entry in batch.entries])
+        for entry, reg in zip(batch.entries, [self.regs[0], self.regs[2]]):
+            art = bytes(batch.buffer[entry.offset:entry.offset + entry.length]).decode('utf-8')
+            self.assertEqual(regart.generate(reg), art)
+
+    def test__invalid_registers_are_reported(self):
+        batch = render_batch(self.regs)
+        self.assertEqual(['BAD: Sections do not fill the register width.'], [str(e) for e in batch.errors])
+
+    def test__process_pool_gives_the_same_output(self):
+        single = render_batch(self.regs)
+        pooled = render_batch(iter(self.regs), workers=2)
+        self.assertEqual(single.buffer, pooled.buffer)
+        self.assertEqual(single.entries, pooled.entries)
+
+    def test__environment_cache_is_used_without_the_process_pool(self):
+        uncached = render_batch(self.regs)
+        os.environ['REGART_CACHE_DIR'] = os.path.join(self.directory, 'cache')
+        render_batch(self.regs)
+        cached = render_batch(self.regs)
+        cache = regart._disk_caches[os.environ['REGART_CACHE_DIR']]
+        self.assertEqual(4, cache.misses)
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(uncached.buffer, cached.buffer)
+        self.assertEqual(uncached.entries, cached.entries)
+        self.assertEqual([str(e) for e in uncached.errors], [str(e) for e in cached.errors])
+
+    def test__exported_file_can_be_sliced_with_the_index(self):
+        path = os.path.join(self.directory, 'regs.txt')
+        index_path = os.path.join(self.directory, 'regs.idx')
+        result = export(self.regs, path, index_path)
+        self.assertEqual(2, result.exported)
+        self.assertEqual(os.path.getsize(path), result.size)
+        entries = read_index(index_path)
+        self.assertEqual(Entry('STATUS', '0x10', entries[1].offset, entries[1].length), entries[1])
+        self.assertEqual(regart.generate(self.regs[2]), read_art(path, entries[1]))
@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+import regart
+from regart import Section
+
+
+class FieldLookup(TestCase):
+    def setUp(self):
+        self.reg = {
+            'name': 'CTRL',
+            'width': 8,
+            'sections': {
+                'DATA': {'position': 4, 'size': 4},
+                'MODE': {'position': 1, 'size': 3},
+                'EN': {'position': 0, 'size': 1}
+            }
+        }
+
+    def test__field_at_every_bit(self):
+        names = [regart.field_at(self.reg, bit).name for bit in range(8)]
+        self.assertEqual(['EN', 'MODE', 'MODE', 'MODE', 'DATA', 'DATA', 'DATA', 'DATA'], names)
+
+    def test__field_at_outside_of_the_register(self):
+        self.assertIsNone(regart.field_at(self.reg, 8))
+        self.assertIsNone(regart.field_at(self.reg, -1))
+
+    def test__field_at_filled_hole(self):
+        del self.reg['sections']['MODE']
+        self.assertEqual(Section('-', 2, 1), regart.field_at(self.reg, 2, forgiveness=True))
+
+    def test__fields_in_range(self):
+        self.assertEqual(
+            [Section('DATA', 4, 4), Section('MODE', 1, 3)],
+            regart.fields_in_range(self.reg, 2, 5)
+        )
+        self.assertEqual([Section('EN', 0, 1)], regart.fields_in_range(self.reg, 0, 0))
+        self.assertEqual([Section('DATA', 4, 4)], regart.fields_in_range(self.reg, 7, 6))
+
+    def test__lookup_on_wide_register(self):
+        reg = {
+            'width': 4096,
+            'sections': dict(('F{}'.format(i), {'position': i * 4, 'size': 4}) for i in range(1024))
+        }
+        layout = regart.compile(reg)
+        self.assertEqual('F777', layout.field_at(777 * 4 + 3).name)
+        self.assertEqual(['F3', 'F2', 'F1'], [s.name for s in layout.fields_in_range(7, 12)])
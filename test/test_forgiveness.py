@@ -0,0 +1,80 @@
+import threading
+from unittest import TestCase
+
+import regart
+from regart import Resolution, Section
+
+
+def _reg(width, sections):
+    return {
+        'name': 'REG',
+        'width': width,
+        'sections': dict((name, {'position': position, 'size': size}) for name, position, size in sections)
+    }
+
+
+class IntervalSweep(TestCase):
+    def test__partial_overlap_is_clipped(self):
+        layout = regart.compile(_reg(8, [('HIGH', 4, 4), ('LOW', 0, 6)]), forgiveness=True)
+        self.assertEqual((Section('HIGH', 4, 4), Section('LOW', 0, 4)), layout.sections)
+        self.assertEqual((Resolution('clipped', 'LOW', 4, 2, 'HIGH'),), layout.report)
+
+    def test__overlapped_section_keeps_its_uncovered_bits(self):
+        layout = regart.compile(_reg(8, [('A', 4, 4), ('B', 5, 2), ('C', 0, 4)]), forgiveness=True)
+        self.assertEqual((Section('B', 5, 2), Section('A', 4, 1), Section('C', 0, 4)), layout.sections[1:])
+        self.assertEqual((
+            Resolution('filled', '-', 7, 1, None),
+            Resolution('clipped', 'A', 5, 3, 'B'),
+        ), layout.report)
+
+    def test__section_beyond_the_width_is_dropped(self):
+        layout = regart.compile(_reg(4, [('A', 0, 4), ('B', 4, 2)]), forgiveness=True)
+        self.assertEqual((Section('A', 0, 4),), layout.sections)
+        self.assertEqual((Resolution('dropped', 'B', 4, 2, None),), layout.report)
+
+    def test__higher_section_wins(self):
+        layout = regart.compile(_reg(8, [('A', 0, 8), ('B', 4, 4)]), forgiveness=True)
+        self.assertEqual((Section('B', 4, 4), Section('A', 0, 4)), layout.sections)
+        self.assertEqual((Resolution('clipped', 'A', 4, 4, 'B'),), layout.report)
+
+    def test__equal_positions_keep_the_first_section(self):
+        layout = regart.compile(_reg(4, [('B', 0, 4), ('A', 0, 4)]), forgiveness=True)
+        self.assertEqual((Section('A', 0, 4),), layout.sections)
+        self.assertEqual((Resolution('dropped', 'B', 0, 4, 'A'),), layout.report)
+
+    def test__holes_are_filled_in_the_same_pass(self):
+        layout = regart.compile(_reg(8, [('HIGH', 5, 2), ('LOW', 1, 2)]), forgiveness=True)
+        self.assertEqual(['-', 'HIGH', '-', '-', 'LOW', '-'], [s.name for s in layout.sections])
+        self.assertEqual((
+            Resolution('filled', '-', 7, 1, None),
+            Resolution('filled', '-', 3, 2, None),
+            Resolution('filled', '-', 0, 1, None)
+        ), layout.report)
+
+    def test__section_beyond_the_width_is_clipped(self):
+        layout = regart.compile(_reg(8, [('A', 4, 8), ('B', 0, 4)]), forgiveness=True)
+        self.assertEqual((Section('A', 4, 4), Section('B', 0, 4)), layout.sections)
+        self.assertEqual((Resolution('clipped', 'A', 8, 4, None),), layout.report)
+
+    def test__strict_mode_has_no_report(self):
+        layout = regart.compile(_reg(8, [('A', 0, 8)]))
+        self.assertEqual((), layout.report)
+
+    def test__thousands_of_overlapping_fields(self):
+        sections = [('F{}'.format(i), i * 2, 3) for i in range(2048)]
+        layout = regart.compile(_reg(4096, sections), forgiveness=True)
+        self.assertEqual(4096, sum(s.size for s in layout.sections))
+        self.assertEqual(2048, len(layout.sections))
+        self.assertEqual(2048, len([r for r in layout.report if r.kind == 'clipped']))
+        self.assertEqual('F1000', layout.field_at(2001).name)
+
+    def test__filler_sections_are_safe_to_build_from_threads(self):
+        regart._fillers = ()
+        widths = [17 + i * 37 for i in range(64)]
+        threads = [threading.Thread(target=regart._filler_sections, args=(width,)) for width in widths]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        fillers = regart._filler_sections(max(widths))
+        self.assertEqual(list(range(len(fillers))), [s.position for s in fillers])
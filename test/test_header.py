@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import regart
+from regart import generate
+from regart.header import marker
+from regart.header import update_file
+from regart.header import update_text
+from regart.header import update_tree
+
+SPEC = '{"name": "REGA", "width": 4, "sections": {"A": {"position": 0, "size": 4}}}'
+
+
+class HeaderUpdate(TestCase):
+    def test__art_is_inserted_below_a_new_marker(self):
+        text = '#define A 1\n/* regart: ' + SPEC + ' */\n#define B 2\n'
+        result, counts = update_text(text)
+        lines = result.split('\n')
+        self.assertTrue(lines[1].startswith('/* regart:'))
+        self.assertEqual(generate({'name': 'REGA', 'width': 4, 'sections': {'A': {'position': 0, 'size': 4}}}),
+                         '\n'.join(lines[2:9]) + '\n')
+        self.assertEqual('#define B 2', lines[9])
+        self.assertEqual((1, 0), tuple(counts))
+
+    def test__unchanged_blocks_are_kept(self):
+        text, _ = update_text('/* regart: ' + SPEC + ' */\n')
+        result, counts = update_text(text)
+        self.assertEqual(text, result)
+        self.assertEqual((0, 1), tuple(counts))
+
+    def test__crlf_blocks_are_kept(self):
+        text, _ = update_text('#define A 1\r\n/* regart: ' + SPEC + ' */\r\n#define B 2\r\n')
+        result, counts = update_text(text)
+        self.assertEqual(text, result)
+        self.assertEqual((0, 1), tuple(counts))
+        self.assertEqual(1, result.count('/*-'))
+        self.assertEqual(result.count('\n'), result.count('\r\n'))
+
+    def test__changed_definition_is_rendered_again(self):
+        text, _ = update_text('/* regart: ' + SPEC + ' */\n')
+        text = text.replace('"width": 4', '"width": 8').replace('"size": 4', '"size": 8')
+        result, counts = update_text(text)
+        self.assertEqual((1, 0), tuple(counts))
+        self.assertEqual(1, result.count('/*-'))
+        self.assertIn('| 7 | 6 |', result)
+
+    def test__indentation_and_forgiveness_are_kept(self):
+        spec = '{"forgiveness": true, "name": "REGA", "sections": {"A": {"position": 0, "size": 2}}, "width": 4}'
+        result, _ = update_text('    /* regart: ' + spec + ' */\n')
+        for line in result.splitlines():
+            self.assertTrue(line.startswith('    '))
+        self.assertIn('| - | - | A     |', result)
+
+    def test__marker_can_be_generated_for_a_definition(self):
+        spec = {'name': 'REGA', 'width': 4}
+        text, _ = update_text(marker(spec) + '\n')
+        self.assertTrue(text.startswith(marker(spec) + '\n'))
+        _, counts = update_text(text)
+        self.assertEqual((0, 1), tuple(counts))
+
+    def test__render_format_change_renders_blocks_again(self):
+        text, _ = update_text('/* regart: ' + SPEC + ' */\n')
+        with patch.object(regart, 'RENDER_FORMAT', regart.RENDER_FORMAT + 1):
+            _, counts = update_text(text)
+        self.assertEqual((1, 0), tuple(counts))
+
+    def test__invalid_definition_reports_the_line(self):
+        with self.assertRaises(ValueError) as cm:
+            update_text('\n/* regart: {"width": 4, "sections": {}} */\n')
+        self.assertIn('Line 2', cm.exception.args[0])
+
+
+class HeaderFiles(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'regs.h')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, content):
+        with open(self.path, 'w') as f:
+            f.write(content)
+
+    def test__file_without_marker_is_not_touched(self):
+        self._write('#define A 1\n')
+        mtime = os.stat(self.path).st_mtime
+        self.assertEqual((0, 0), tuple(update_file(self.path)))
+        self.assertEqual(mtime, os.stat(self.path).st_mtime)
+
+    def test__file_is_rewritten_only_when_needed(self):
+        self._write('/* regart: ' + SPEC + ' */\n')
+        self.assertEqual((1, 0), tuple(update_file(self.path)))
+        with open(self.path) as f:
+            content = f.read()
+        self.assertEqual((0, 1), tuple(update_file(self.path)))
+        with open(self.path) as f:
+            self.assertEqual(content, f.read())
+        self.assertEqual(['regs.h'], os.listdir(self.directory))
+
+    def test__empty_file_is_skipped(self):
+        self._write('')
+        self.assertEqual((0, 0), tuple(update_file(self.path)))
+
+
+class HeaderTrees(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, path, content):
+        path = os.path.join(self.directory, path)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def test__tree_can_be_updated(self):
+        self._write('a/regs.h', '/* regart: ' + SPEC + ' */\n')
+        self._write('a/b/more.h', '/* regart: {"width": 2} */\n/* regart: {"width": 3} */\n')
+        self._write('a/b/plain.c', 'int x;\n')
+        self._write('a/notes.txt', '/* regart: {"width": 2} */\n')
+        self._write('.hidden/regs.h', '/* regart: {"width": 2} */\n')
+        result = update_tree(self.directory, workers=2)
+        self.assertEqual((3, 2, 3, 0, []), tuple(result))
+        result = update_tree(self.directory, workers=1)
+        self.assertEqual((3, 0, 0, 3, []), tuple(result))
+
+    def test__errors_are_collected(self):
+        self._write('bad.h', '/* regart: {"width": 2, "sections": {}} */\n')
+        self._write('good.h', '/* regart: {"width": 2} */\n')
+        result = update_tree(self.directory, workers=1)
+        self.assertEqual(1, result.rendered)
+        self.assertEqual(1, len(result.errors))
+        self.assertIn('bad.h', result.errors[0].args[0])
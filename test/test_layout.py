@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+import regart
+from regart import generate
+
+
+class CompiledLayout(TestCase):
+    def setUp(self):
+        self.reg = {
+            'width': 8,
+            'name': 'UART0',
+            'address': '0x4000',
+            'sections': {
+                'STATUS': {
+                    'position': 5,
+                    'size': 3
+                },
+                'CARRY': {
+                    'position': 4,
+                    'size': 1
+                },
+                'ENABLE': {
+                    'position': 3,
+                    'size': 1
+                },
+                'SUM': {
+                    'position': 0,
+                    'size': 3
+                }
+            }
+        }
+
+    def _instance(self, name, address):
+        reg = dict(self.reg)
+        reg['name'] = name
+        reg['address'] = address
+        reg['sections'] = dict((k, dict(v)) for k, v in self.reg['sections'].items())
+        return reg
+
+    def test__render_without_arguments_equals_generate(self):
+        layout = regart.compile(self.reg)
+        self.assertEqual(generate(self._instance('UART0', '0x4000')), layout.render())
+
+    def test__layout_can_be_rendered_for_other_instances(self):
+        layout = regart.compile(self.reg)
+        for i in range(4):
+            name = 'UART{}'.format(i)
+            address = 0x4000 + i * 0x100
+            expected = generate(self._instance(name, address))
+            self.assertEqual(expected, layout.render(name=name, address=address))
+
+    def test__long_instance_name_expands_the_layout(self):
+        layout = regart.compile(self.reg)
+        name = 'A_VERY_LONG_PERIPHERAL_INSTANCE_NAME'
+        expected = generate(self._instance(name, '0x4000'))
+        self.assertEqual(expected, layout.render(name=name))
+
+    def test__instance_named_as_its_first_section(self):
+        layout = regart.compile(self.reg)
+        expected = generate(self._instance('STATUS', '0x4000'))
+        self.assertEqual(expected, layout.render(name='STATUS'))
+
+    def test__implicit_section_follows_the_instance_name(self):
+        layout = regart.compile({'name': 'REGA', 'width': 4})
+        expected = generate({'name': 'REGB', 'width': 4, 'address': 16})
+        self.assertEqual(expected, layout.render(name='REGB', address=16))
+
+    def test__layout_is_immutable(self):
+        layout = regart.compile(self.reg)
+        with self.assertRaises(AttributeError):
+            layout.width = 16
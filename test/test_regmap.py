@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from regart.regmap import iter_map, RegisterMap
+
+
+class RegisterMapFiles(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, content):
+        path = os.path.join(self.directory, 'map.json')
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test__json_list_can_be_read(self):
+        path = self._write('\n  [{"name": "A"},\n {"name": "B", "width": 4}]\n')
+        self.assertEqual([{'name': 'A'}, {'name': 'B', 'width': 4}], list(iter_map(path)))
+
+    def test__json_lines_can_be_read(self):
+        path = self._write('\n{"name": "A"}\n\n{"name": "B", "width": 4}\n')
+        self.assertEqual([{'name': 'A'}, {'name': 'B', 'width': 4}], list(iter_map(path)))
+
+    def test__invalid_line_is_reported_with_its_number(self):
+        path = self._write('{"name": "A"}\n{"name": \n')
+        with self.assertRaises(ValueError) as cm:
+            list(iter_map(path))
+        self.assertIn('line 2', cm.exception.args[0])
+
+    def test__empty_file_gives_no_registers(self):
+        path = self._write('\n\n')
+        self.assertEqual([], list(iter_map(path)))
+
+
+class AddressRanges(TestCase):
+    def setUp(self):
+        self.regs = [
+            {'name': 'C', 'address': '0x40010008', 'width': 32},
+            {'name': 'A', 'address': '0x40010000', 'width': 32},
+            {'name': 'WIDE', 'address': '0x4000FFF0', 'width': 128},
+            {'name': 'B', 'address': 0x40010004, 'width': 8},
+            {'name': 'NOADDR'},
+            {'name': 'D', 'address': '0x40020000', 'width': 32}
+        ]
+        self.map = RegisterMap(self.regs)
+
+    def _names(self, lo, hi):
+        return [reg['name'] for reg in self.map.in_range(lo, hi)]
+
+    def test__registers_without_address_are_left_out(self):
+        self.assertEqual(5, len(self.map))
+
+    def test__registers_in_range_are_sorted_by_address(self):
+        self.assertEqual(['A', 'B', 'C'], self._names('0x40010000', '0x4001FFFF'))
+
+    def test__range_bounds_are_inclusive(self):
+        self.assertEqual(['B'], self._names('0x40010004', '0x40010004'))
+        self.assertEqual(['D'], self._names('0x40020000', 0x40020000))
+
+    def test__register_spanning_into_the_range_is_found(self):
+        self.assertEqual(['WIDE', 'A'], self._names('0x4000FFFF', '0x40010000'))
+        self.assertEqual(['A'], self._names('0x40010003', '0x40010003'))
+
+    def test__empty_range(self):
+        self.assertEqual([], self._names('0x40010005', '0x40010007'))
+
+    def test__invalid_address_is_reported_with_the_register_name(self):
+        with self.assertRaises(ValueError) as cm:
+            RegisterMap([{'name': 'X', 'address': '0xZZ'}])
+        self.assertTrue(cm.exception.args[0].startswith('X: '))
@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import TestCase
+
+from regart import generate
+from regart.server import request
+from regart.server import respond
+
+
+class Protocol(TestCase):
+    def test__successful_render(self):
+        response = json.loads(respond(b'{"reg": {"width": 4}}\n').decode('utf-8'))
+        self.assertEqual({'ok': True, 'result': generate({'width': 4})}, response)
+
+    def test__forgiveness_can_be_requested(self):
+        line = json.dumps({'reg': {'width': 4, 'sections': {'A': {'position': 0, 'size': 1}}}, 'forgiveness': True})
+        response = json.loads(respond(line.encode('utf-8')).decode('utf-8'))
+        self.assertTrue(response['ok'])
+        self.assertIn('| - | - | - | A |', response['result'])
+
+    def test__render_error_is_reported(self):
+        response = json.loads(respond(b'{"reg": {"width": 4, "sections": {}}}\n').decode('utf-8'))
+        self.assertEqual({'ok': False, 'error': 'Sections do not fill the register width.'}, response)
+
+    def test__invalid_request_is_reported(self):
+        response = json.loads(respond(b'{"reg": \n').decode('utf-8'))
+        self.assertFalse(response['ok'])
+
+
+class Server(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'regart.sock')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.process = subprocess.Popen([sys.executable, '-m', 'regart', '--serve', self.path], cwd=root)
+        for _ in range(100):
+            if os.path.exists(self.path):
+                break
+            time.sleep(0.05)
+
+    def tearDown(self):
+        self.process.terminate()
+        self.process.wait()
+        shutil.rmtree(self.directory)
+
+    def test__registers_can_be_rendered_by_the_server(self):
+        reg = {'name': 'REGA', 'address': 16, 'width': 4}
+        self.assertEqual(generate(reg), request(self.path, reg))
+        self.assertEqual(generate(reg), request(self.path, reg))
+
+    def test__render_errors_are_raised_on_the_client_side(self):
+        with self.assertRaises(ValueError) as cm:
+            request(self.path, {'width': 4, 'sections': {}})
+        self.assertEqual('Sections do not fill the register width.', cm.exception.args[0])
+
+    def test__socket_is_removed_on_shutdown(self):
+        self.process.terminate()
+        self.process.wait()
+        self.assertFalse(os.path.exists(self.path))
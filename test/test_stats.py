@@ -0,0 +1,69 @@
+import io
+from unittest import TestCase
+
+import regart
+from regart import generate
+from regart import Stats
+
+
+def _reg():
+    return {
+        'width': 8,
+        'name': 'REGA',
+        'sections': {
+            'A_VERY_LONG_NAME': {
+                'position': 4,
+                'size': 1
+            },
+            'B': {
+                'position': 0,
+                'size': 2
+            },
+            'C': {
+                'position': 0,
+                'size': 1
+            }
+        }
+    }
+
+
+class PhaseStatistics(TestCase):
+    def test__stats_do_not_change_the_output(self):
+        self.assertEqual(generate(_reg(), True), generate(_reg(), True, stats=Stats()))
+
+    def test__every_phase_is_timed(self):
+        stats = Stats()
+        generate(_reg(), forgiveness=True, stats=stats)
+        generate(_reg(), forgiveness=True, stats=stats)
+        self.assertEqual(['normalize', 'transform', 'forgive', 'validate', 'solve', 'render'], list(stats.times))
+        for calls, seconds in stats.times.values():
+            self.assertEqual(2, calls)
+            self.assertTrue(seconds >= 0)
+
+    def test__layout_counts_are_collected(self):
+        stats = Stats()
+        generate(_reg(), forgiveness=True, stats=stats)
+        self.assertEqual(1, stats.counts['registers'])
+        self.assertEqual(1, stats.counts['redefinitions dropped'])
+        self.assertEqual(6, stats.counts['holes filled'])
+        self.assertEqual(8, stats.counts['sections'])
+        self.assertEqual(1, stats.counts['expansions'])
+
+    def test__forgive_phase_is_skipped_without_forgiveness(self):
+        stats = Stats()
+        regart.render_to({'width': 4}, io.StringIO(), stats=stats)
+        self.assertNotIn('forgive', stats.times)
+        self.assertIn('render', stats.times)
+
+    def test__batch_statistics_are_merged_from_the_workers(self):
+        stats = Stats()
+        regart.generate_many([_reg() for _ in range(6)], forgiveness=True, workers=2, chunksize=2, stats=stats)
+        self.assertEqual(6, stats.counts['registers'])
+        self.assertEqual(6, stats.times['render'][0])
+
+    def test__table_lists_phases_and_counts(self):
+        stats = Stats()
+        generate(_reg(), forgiveness=True, stats=stats)
+        table = stats.table()
+        self.assertIn('normalize', table)
+        self.assertIn('holes filled', table)
@@ -0,0 +1,51 @@
+import io
+from unittest import TestCase
+
+import regart
+from regart import generate
+
+
+def _reg():
+    return {
+        'width': 8,
+        'name': 'REGA',
+        'address': '0x123',
+        'sections': {
+            'STATUS': {
+                'position': 5,
+                'size': 3
+            },
+            'SUM': {
+                'position': 0,
+                'size': 5
+            }
+        }
+    }
+
+
+class Streaming(TestCase):
+    def test__lines_add_up_to_the_generated_art(self):
+        lines = list(regart.iter_lines(_reg()))
+        self.assertEqual(7, len(lines))
+        self.assertEqual(generate(_reg()), ''.join(lines))
+
+    def test__register_without_sections_row(self):
+        lines = list(regart.iter_lines({'width': 4}))
+        self.assertEqual(5, len(lines))
+        self.assertEqual(generate({'width': 4}), ''.join(lines))
+
+    def test__render_to_writes_into_the_stream(self):
+        stream = io.StringIO()
+        regart.render_to(_reg(), stream)
+        regart.render_to({'width': 4}, stream)
+        self.assertEqual(generate(_reg()) + generate({'width': 4}), stream.getvalue())
+
+    def test__errors_are_raised_before_anything_is_written(self):
+        reg = _reg()
+        reg['sections']['SUM']['size'] = 4
+        stream = io.StringIO()
+        with self.assertRaises(ValueError):
+            regart.render_to(reg, stream)
+        with self.assertRaises(ValueError):
+            regart.iter_lines(reg)
+        self.assertEqual('', stream.getvalue())
@@ -0,0 +1,123 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from regart import generate
+from regart.svd import iter_registers, _referenced_peripherals
+
+SVD = b'''\
+<?xml version="1.0" encoding="utf-8"?>
+<device schemaVersion="1.3">
+  <name>DEV</name>
+  <size>32</size>
+  <peripherals>
+    <peripheral>
+      <name>UART0</name>
+      <baseAddress>0x40001000</baseAddress>
+      <size>8</size>
+      <registers>
+        <register>
+          <name>CR</name>
+          <addressOffset>0x4</addressOffset>
+          <fields>
+            <field><name>EN</name><bitOffset>0</bitOffset><bitWidth>1</bitWidth></field>
+            <field><name>MODE</name><lsb>1</lsb><msb>3</msb></field>
+            <field><name>DIV</name><bitRange>[7:4]</bitRange></field>
+          </fields>
+        </register>
+        <register>
+          <dim>2</dim>
+          <dimIncrement>1</dimIncrement>
+          <name>DATA%s</name>
+          <addressOffset>0x8</addressOffset>
+        </register>
+        <cluster>
+          <name>CH</name>
+          <addressOffset>0x10</addressOffset>
+          <register>
+            <name>CFG</name>
+            <addressOffset>0x2</addressOffset>
+            <size>4</size>
+          </register>
+        </cluster>
+      </registers>
+    </peripheral>
+    <peripheral derivedFrom="UART0">
+      <name>UART1</name>
+      <baseAddress>0x40002000</baseAddress>
+    </peripheral>
+    <peripheral>
+      <name>TIMER0</name>
+      <baseAddress>0x40003000</baseAddress>
+      <registers>
+        <register>
+          <name>CNT</name>
+          <addressOffset>0</addressOffset>
+          <fields>
+            <field><name>VALUE</name><bitOffset>0</bitOffset><bitWidth>16</bitWidth></field>
+          </fields>
+        </register>
+      </registers>
+    </peripheral>
+  </peripherals>
+</device>
+'''
+
+
+def _registers(peripheral=None):
+    return list(iter_registers(io.BytesIO(SVD), peripheral))
+
+
+class SvdImport(TestCase):
+    def test__fields_are_converted_to_sections(self):
+        expected = {
+            'name': 'UART0_CR',
+            'address': '0x40001004',
+            'width': 8,
+            'sections': {
+                'EN': {'position': 0, 'size': 1},
+                'MODE': {'position': 1, 'size': 3},
+                'DIV': {'position': 4, 'size': 4}
+            }
+        }
+        self.assertEqual(expected, _registers()[0])
+
+    def test__register_arrays_clusters_and_derived_peripherals(self):
+        names = [(reg['name'], reg['address'], reg['width']) for reg in _registers()]
+        expected = [
+            ('UART0_CR', '0x40001004', 8),
+            ('UART0_DATA0', '0x40001008', 8),
+            ('UART0_DATA1', '0x40001009', 8),
+            ('UART0_CH_CFG', '0x40001012', 4),
+            ('UART1_CR', '0x40002004', 8),
+            ('UART1_DATA0', '0x40002008', 8),
+            ('UART1_DATA1', '0x40002009', 8),
+            ('UART1_CH_CFG', '0x40002012', 4),
+            ('TIMER0_CNT', '0x40003000', 32)
+        ]
+        self.assertEqual(expected, names)
+
+    def test__peripherals_can_be_selected_by_pattern(self):
+        names = [reg['name'] for reg in _registers('UART1')]
+        self.assertEqual(['UART1_CR', 'UART1_DATA0', 'UART1_DATA1', 'UART1_CH_CFG'], names)
+        names = [reg['name'] for reg in _registers('TIM*')]
+        self.assertEqual(['TIMER0_CNT'], names)
+
+    def test__imported_registers_can_be_rendered(self):
+        for reg in _registers():
+            generate(reg, forgiveness=True)
+
+    def test__only_referenced_peripherals_are_kept_for_derivation(self):
+        self.assertEqual({'UART0'}, _referenced_peripherals(io.BytesIO(SVD)))
+
+    def test__file_path_gives_the_same_registers(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'device.svd')
+            with open(path, 'wb') as f:
+                f.write(SVD)
+            self.assertEqual(_registers(), list(iter_registers(path)))
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,82 @@
+import io
+import json
+from unittest import TestCase
+
+from regart.trace import build_index, decode_line, decode_stream, iter_decode
+
+
+class TraceDecoding(TestCase):
+    def setUp(self):
+        self.regs = [
+            {
+                'name': 'CTRL',
+                'address': '0x40001000',
+                'width': 32,
+                'sections': {
+                    'DATA': {'position': 16, 'size': 16},
+                    'MODE': {'position': 1, 'size': 3},
+                    'EN': {'position': 0, 'size': 1}
+                }
+            },
+            {
+                'name': 'STAT',
+                'address': '0x40001004',
+                'width': 32
+            },
+            {
+                'name': 'NOADDR'
+            }
+        ]
+        self.index = build_index(self.regs, forgiveness=True)
+
+    def test__registers_are_indexed_by_address(self):
+        self.assertEqual([0x40001000, 0x40001004], sorted(self.index))
+
+    def test__line_is_decoded_into_fields(self):
+        result = decode_line('0x40001000=0xDEADBEEF\n', self.index)
+        self.assertEqual('CTRL 0x40001000=0xDEADBEEF DATA=0xDEAD MODE=0x7 EN=1', result)
+
+    def test__reserved_bits_are_left_out(self):
+        result = decode_line('0x40001000=0x1', self.index)
+        self.assertNotIn('-=', result)
+
+    def test__binary_field_format(self):
+        index = build_index(self.regs, forgiveness=True, value_format='bin')
+        result = decode_line('0x40001000=0x0001000B', index)
+        self.assertEqual('CTRL 0x40001000=0x0001000B DATA=0000000000000001 MODE=101 EN=1', result)
+
+    def test__json_line(self):
+        result = json.loads(decode_line('0x40001000=0xdeadbeef', self.index, as_json=True))
+        self.assertEqual({
+            'name': 'CTRL',
+            'address': '0x40001000',
+            'value': '0xDEADBEEF',
+            'fields': {'DATA': 0xDEAD, 'MODE': 7, 'EN': 1}
+        }, result)
+
+    def test__unknown_lines_are_passed_through(self):
+        self.assertEqual('0x5=0x1', decode_line('0x5=0x1\n', self.index))
+        self.assertEqual('hello', decode_line('hello\n', self.index))
+        self.assertIsNone(decode_line('hello\n', self.index, as_json=True))
+
+    def test__stream_keeps_the_input_order(self):
+        lines = ['0x40001004=0x{:X}\n'.format(i) for i in range(100)]
+        expected = ['STAT 0x40001004=0x{:X} STAT=0x{:08X}'.format(i, i) for i in range(100)]
+        self.assertEqual(expected, list(iter_decode(iter(lines), self.index)))
+        self.assertEqual(expected, list(iter_decode(iter(lines), self.index, workers=2, chunksize=7)))
+
+    def test__stream_is_written_to_a_file(self):
+        stream = io.StringIO()
+        decode_stream(['0x40001004=0x2\n', 'x\n'], stream, self.index, workers=2, chunksize=1)
+        self.assertEqual('STAT 0x40001004=0x2 STAT=0x00000002\nx\n', stream.getvalue())
+
+    def test__invalid_register_is_reported_with_its_name(self):
+        with self.assertRaises(ValueError) as cm:
+            build_index(self.regs)
+        self.assertEqual('CTRL: Sections do not fill the register width.', cm.exception.args[0])
+
+    def test__invalid_registers_can_be_skipped(self):
+        errors = []
+        index = build_index(self.regs, errors=errors)
+        self.assertEqual([0x40001004], sorted(index))
+        self.assertEqual(['CTRL: Sections do not fill the register width.'], [str(e) for e in errors])
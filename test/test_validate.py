@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+import regart
+from regart import Violation
+
+
+def _reg(width, sections, name='REG'):
+    return {
+        'name': name,
+        'width': width,
+        'sections': dict((n, {'position': position, 'size': size}) for n, position, size in sections)
+    }
+
+
+class CollectValidation(TestCase):
+    def test__valid_register_has_no_violations(self):
+        self.assertEqual([], regart.validate(_reg(8, [('A', 4, 4), ('B', 0, 4)]), collect=True))
+
+    def test__every_overlap_is_reported(self):
+        reg = _reg(8, [('A', 0, 8), ('B', 0, 1), ('C', 7, 1)])
+        self.assertEqual([
+            Violation('REG', 'B', 0, 0, 'overlap', 'Section position redefined.'),
+            Violation('REG', 'C', 7, 7, 'overlap', 'Section position redefined.')
+        ], regart.validate(reg, collect=True))
+
+    def test__every_gap_is_reported(self):
+        reg = _reg(16, [('A', 2, 4), ('B', 8, 4)])
+        self.assertEqual([
+            Violation('REG', None, 0, 1, 'gap', 'Sections do not fill the register width.'),
+            Violation('REG', None, 6, 7, 'gap', 'Sections do not fill the register width.'),
+            Violation('REG', None, 12, 15, 'gap', 'Sections do not fill the register width.')
+        ], regart.validate(reg, collect=True))
+
+    def test__overflow_is_reported(self):
+        reg = _reg(8, [('A', 0, 8), ('B', 8, 2)])
+        self.assertEqual([
+            Violation('REG', 'B', 8, 9, 'overflow', 'Sections size exceed the register width.')
+        ], regart.validate(reg, collect=True))
+
+    def test__negative_positions_follow_the_strict_validation(self):
+        self.assertEqual([], regart.validate(_reg(1, [('A', -1, 1)]), collect=True))
+        self.assertEqual([
+            Violation('REG', 'A', -2, -1, 'overflow', 'Sections size exceed the register width.')
+        ], regart.validate(_reg(8, [('A', -2, 2), ('B', 0, 8)]), collect=True))
+        self.assertEqual([
+            Violation('REG', None, 2, 7, 'gap', 'Sections do not fill the register width.')
+        ], regart.validate(_reg(8, [('A', -4, 2), ('B', 0, 2)]), collect=True))
+
+    def test__invalid_values_of_every_section_are_reported(self):
+        reg = {'sections': {'A': {'position': 'x', 'size': 1}, 'B': {'size': 1}}}
+        violations = regart.validate(reg, collect=True)
+        self.assertEqual([('A', 'value'), ('B', 'value')], [(v.section, v.kind) for v in violations])
+        self.assertEqual('Section is missing the "position" key.', violations[1].message)
+
+    def test__forgiveness_only_reports_invalid_values(self):
+        self.assertEqual([], regart.validate(_reg(8, [('A', 0, 8), ('B', 0, 1)]), forgiveness=True, collect=True))
+
+    def test__violations_match_the_strict_validation(self):
+        regs = [
+            _reg(8, [('A', 0, 4)]),
+            _reg(8, [('A', 0, 4), ('B', 2, 4)]),
+            _reg(8, [('A', 0, 6), ('B', 4, 4)]),
+            _reg(8, [('A', 0, 4), ('B', 4, 4)]),
+            _reg(8, [('A', 0, 4), ('B', 4, 0), ('C', 4, 4)]),
+            _reg(1, [('A', -1, 1)]),
+            _reg(8, [('A', -2, 4), ('B', 2, 6)]),
+            _reg(8, [('A', -2, 2), ('B', 0, 8)]),
+            _reg(8, [('A', -4, 2), ('B', 0, 6)])
+        ]
+        for reg in regs:
+            try:
+                regart.validate(reg)
+                valid = True
+            except ValueError:
+                valid = False
+            self.assertEqual(valid, not regart.validate(reg, collect=True))
+
+    def test__strict_validation_raises_the_first_error(self):
+        with self.assertRaises(ValueError) as cm:
+            regart.validate(_reg(8, [('A', 0, 4)]))
+        self.assertEqual('Sections do not fill the register width.', cm.exception.args[0])
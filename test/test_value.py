@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+import regart
+from regart import generate
+
+
+class ValueDecoding(TestCase):
+    def setUp(self):
+        self.reg = {
+            'name': 'CTRL',
+            'width': 8,
+            'sections': {
+                'DATA': {
+                    'position': 4,
+                    'size': 4
+                },
+                'MODE': {
+                    'position': 1,
+                    'size': 3
+                },
+                'EN': {
+                    'position': 0,
+                    'size': 1
+                }
+            }
+        }
+
+    def test__hex_value_row_is_aligned_to_the_sections(self):
+        expected = \
+            '/*-------------------------------#\n' + \
+            '| CTRL                           |\n' + \
+            '#--------------------------------#\n' + \
+            '| DATA          | MODE      | EN |\n' + \
+            '#--------------------------------#\n' + \
+            '| 7 | 6 | 5 | 4 | 3 | 2 | 1 | 0  |\n' + \
+            '#--------------------------------#\n' + \
+            '| 0xA           | 0x2       | 1  |\n' + \
+            '#-------------------------------*/\n'
+        result = generate(self.reg, value=0xA5, cache=False)
+        self.assertEqual(expected, result)
+
+    def test__both_formats_add_two_rows(self):
+        result = generate(self.reg, value='0xA5', value_format='both', cache=False)
+        lines = result.splitlines()
+        self.assertEqual('| 0xA           | 0x2       | 1  |', lines[7])
+        self.assertEqual('| 1010          | 010       | 1  |', lines[8])
+
+    def test__value_without_sections_fills_a_single_cell(self):
+        expected = \
+            '/*------------------------------#\n' + \
+            '| REG                           |\n' + \
+            '#-------------------------------#\n' + \
+            '| 7 | 6 | 5 | 4 | 3 | 2 | 1 | 0 |\n' + \
+            '#-------------------------------#\n' + \
+            '| 10100101                      |\n' + \
+            '#------------------------------*/\n'
+        result = generate({}, value=0xA5, value_format='bin', cache=False)
+        self.assertEqual(expected, result)
+
+    def test__decode_returns_the_fields_in_section_order(self):
+        layout = regart.compile(self.reg)
+        self.assertEqual([0xA, 0x2, 1], layout.decode(0xA5))
+
+    def test__decode_wide_register(self):
+        reg = {'width': 128, 'sections': {'HIGH': {'position': 64, 'size': 64}, 'LOW': {'position': 0, 'size': 64}}}
+        layout = regart.compile(reg)
+        self.assertEqual([0x1234, 0x5678], layout.decode((0x1234 << 64) | 0x5678))
+
+    def test__value_is_part_of_the_cache_key(self):
+        cache = regart.LRUCache()
+        first = generate(self.reg, value=1, cache=cache)
+        second = generate(self.reg, value=2, cache=cache)
+        self.assertNotEqual(first, second)
+        self.assertEqual(generate(self.reg, cache=False), generate(self.reg, cache=cache))
+
+    def test__too_wide_value_is_rejected(self):
+        with self.assertRaises(ValueError) as cm:
+            generate(self.reg, value=0x100, cache=False)
+        self.assertEqual('Value does not fit into the register width.', cm.exception.args[0])
+
+    def test__invalid_value_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            generate(self.reg, value=1, value_format='oct', cache=False)